@@ -1 +1,3 @@
-from .simulator import Simulator
\ No newline at end of file
+from .simulator import Simulator
+from .instrumentation import GenerationStats, Instrumentation
+from .log import SimulationLog
@@ -0,0 +1,233 @@
+"""
+Benchmark suite of the simulation throughput and scaling
+
+Run as a module, e.g.::
+
+    python -m sail.benchmark --output benchmark.json
+
+The results are written as JSON (one record per measurement) so they can be
+compared between releases to catch performance regressions.
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from .log import QUIET, SimulationLog
+from .model_pack import Model, NeuralNetwork, Population
+from .simulator import Simulator
+
+
+def measure(function, repeat):
+    """
+    Calls function repeat times and returns the best wall-clock time in
+    seconds
+    """
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# heavy optional dependencies which should only be imported on use
+HEAVY_MODULES = ('matplotlib', 'tkinter', 'pandas', 
+                 'concurrent.futures.process', 'cProfile')
+
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(seconds, ','.join(heavy))
+'''
+
+
+def bench_import(module, repeat):
+    """
+    Measures the import time of a module in a fresh interpreter and lists
+    the heavy optional dependencies it imported
+    """
+    best = math.inf
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT.format(module=module, 
+                                                        heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True).stdout.split(' ')
+        best = min(best, float(output[0]))
+    heavy = [m for m in output[1].strip().split(',') if m]
+    return best * 1e3, 'ms', heavy
+
+
+def bench_population_update(nn_architecture, population_size, ticks,
+                            repeat, precision='float64'):
+    """
+    Measures ship-ticks/second of Population.update on a random race
+    """
+    model = Model(nn_architecture, population_size,
+                  np.random.default_rng(0), precision)
+
+    def race():
+        model.prepare_generation(True, 1, np.random.default_rng(1))
+        for t in range(ticks):
+            model.update(t)
+
+    seconds = measure(race, repeat)
+    return population_size * ticks / seconds, 'ship-ticks/s'
+
+
+def bench_predict(nn_architecture, repeat, calls=1000):
+    """
+    Measures the latency of a single NeuralNetwork.predict call
+    """
+    nn = NeuralNetwork(nn_architecture, np.random.default_rng(0))
+
+    def predict():
+        for _ in range(calls):
+            nn.predict(0.5, -0.5)
+
+    return measure(predict, repeat) / calls * 1e6, 'us/call'
+
+
+def bench_batch_predict(nn_architecture, population_size, repeat,
+                        calls=100):
+    """
+    Measures the latency of a BatchNeuralNetwork.predict call of the whole
+    population (one simulation tick)
+    """
+    population = Population(nn_architecture, population_size,
+                            np.random.default_rng(0))
+    network = population.batch_network(population.genomes)
+    angles = np.random.default_rng(1).uniform(-math.pi, math.pi,
+                                              size=(2, population_size))
+
+    def predict():
+        for _ in range(calls):
+            network.predict(angles[0], angles[1])
+
+    return measure(predict, repeat) / calls * 1e6, 'us/call'
+
+
+def bench_evolve(nn_architecture, population_size, repeat):
+    """
+    Measures the duration of Population.evolve
+    """
+    population = Population(nn_architecture, population_size,
+                            np.random.default_rng(0))
+    rng = np.random.default_rng(1)
+
+    def evolve():
+        population.ranks[:] = rng.permutation(population_size)
+        population.evolve(30, rng)
+
+    return measure(evolve, repeat) * 1e3, 'ms'
+
+
+def bench_generation(hidden_layers, population_size, race_count, repeat):
+    """
+    Measures end-to-end generations/second of a headless Simulator
+    (races, evaluation, evolution and test race)
+    """
+    sim = Simulator(hidden_layers, repeat, population_size, 30,
+                    random_race=True, race_count=race_count, headless=True,
+                    seed=0, log=SimulationLog(QUIET))
+    generation = iter(range(repeat))
+
+    def run_generation():
+        sim.run_generation(next(generation))
+
+    return 1 / measure(run_generation, repeat), 'generations/s'
+
+
+def parse_architectures(values):
+    """
+    Parses hidden layer specifications like '5' or '16,16' ('' means no
+    hidden layer)
+    """
+    return [[int(n) for n in value.split(',') if n] for value in values]
+
+
+def run(population_sizes, architectures, race_counts, ticks, repeat):
+    """
+    Runs all benchmarks swept over the given parameters
+    Returns
+    list of dictionaries
+        one record per measurement
+    """
+    records = []
+
+    def record(benchmark, params, result):
+        value, unit = result
+        records.append({'benchmark': benchmark, 'params': params,
+                        'value': value, 'unit': unit})
+        print('{:<18s} {:>14.2f} {:<14s} {}'.format(
+            benchmark, value, unit, json.dumps(params)))
+
+    # numpy is the baseline every sail module has to import
+    for module in ('numpy', 'sail', 'sail.simulator'):
+        value, unit, heavy = bench_import(module, repeat)
+        record('import', {'module': module, 'heavy_modules': heavy}, 
+               (value, unit))
+    
+    for hidden in architectures:
+        nn_architecture = [2] + hidden + [1]
+        record('predict', {'nn_architecture': nn_architecture},
+               bench_predict(nn_architecture, repeat))
+        for size in population_sizes:
+            params = {'nn_architecture': nn_architecture,
+                      'population_size': size}
+            record('batch_predict', params,
+                   bench_batch_predict(nn_architecture, size, repeat))
+            for precision in ('float64', 'float32'):
+                record('population_update', 
+                       dict(params, ticks=ticks, precision=precision),
+                       bench_population_update(nn_architecture, size, ticks,
+                                               repeat, precision))
+            record('evolve', params,
+                   bench_evolve(nn_architecture, size, repeat))
+            for race_count in race_counts:
+                record('generation', dict(params, race_count=race_count),
+                       bench_generation(hidden, size, race_count, repeat))
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sail.benchmark',
+        description='Measures simulation throughput and scaling')
+    parser.add_argument('--population-sizes', type=int, nargs='+',
+                        default=[100, 1000])
+    parser.add_argument('--architectures', nargs='+', default=['5', '16,16'],
+                        help="hidden layers, e.g. '5' or '16,16'")
+    parser.add_argument('--race-counts', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--ticks', type=int, default=200,
+                        help='ticks of the population update benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='repetitions, the best time is reported')
+    parser.add_argument('--output', help='path of the JSON results file')
+    parser.add_argument('--import-only', action='store_true',
+                        help='only measure the import times')
+    args = parser.parse_args(argv)
+
+    if args.import_only:
+        args.architectures = []
+    records = run(args.population_sizes,
+                  parse_architectures(args.architectures),
+                  args.race_counts, args.ticks, args.repeat)
+    if args.output is not None:
+        results = {'python': platform.python_version(),
+                   'numpy': np.__version__,
+                   'platform': platform.platform(),
+                   'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'results': records}
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
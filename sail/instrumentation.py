@@ -0,0 +1,190 @@
+import contextlib
+import csv
+import json
+import os
+import time
+import numpy as np
+
+
+class GenerationStats:
+    """
+    Record of a single generation's per-phase wall-clock times and counters
+    """
+    phases = ('prepare', 'simulate', 'evaluate', 'evolve', 'test')
+
+    def __init__(self, generation):
+        self.generation = generation
+        # wall-clock time of each phase in seconds
+        self.times = dict.fromkeys(GenerationStats.phases, 0.0)
+        self.total_time = 0.0
+        self.races = 0
+        # counters of the races (the test race is not included)
+        self.ticks_simulated = 0
+        self.ship_ticks_simulated = 0
+        self.ships_finished_early = 0
+        self.ships_retired = 0
+        self.ships_cached = 0
+        self.ticks_skipped = 0
+
+    @classmethod
+    def merge(cls, records):
+        """
+        Combines the records of the same generation simulated in parallel
+        (e.g. by the islands), the counters are summed and the times are 
+        the longest ones
+        """
+        merged = cls(records[0].generation)
+        for record in records:
+            for phase in GenerationStats.phases:
+                merged.times[phase] = max(merged.times[phase], 
+                                          record.times[phase])
+            merged.total_time = max(merged.total_time, record.total_time)
+            merged.races += record.races
+            merged.ticks_simulated += record.ticks_simulated
+            merged.ship_ticks_simulated += record.ship_ticks_simulated
+            merged.ships_finished_early += record.ships_finished_early
+            merged.ships_retired += record.ships_retired
+            merged.ships_cached += record.ships_cached
+            merged.ticks_skipped += record.ticks_skipped
+        return merged
+
+    def as_dict(self):
+        """
+        Returns the record as a flat dictionary (a row of the CSV file)
+        """
+        record = {'generation': self.generation}
+        for phase in GenerationStats.phases:
+            record['time_' + phase] = self.times[phase]
+        record.update({'time_total': self.total_time,
+                       'races': self.races,
+                       'ticks_simulated': self.ticks_simulated,
+                       'ship_ticks_simulated': self.ship_ticks_simulated,
+                       'ships_finished_early': self.ships_finished_early,
+                       'ships_retired': self.ships_retired,
+                       'ships_cached': self.ships_cached,
+                       'ticks_skipped': self.ticks_skipped})
+        return record
+
+
+class Instrumentation:
+    """
+    Lightweight instrumentation of the simulation
+    Measures the wall-clock time of each phase of the generations and
+    counts the simulated and skipped ticks, the records are passed to a
+    callback and optionally appended to CSV and JSON Lines files
+    One chosen generation can be profiled with cProfile
+    """
+    def __init__(self, callback=None, csv_path=None, json_path=None,
+                 profile_generation=None, profile_path=None):
+        """
+        Parameters
+        callback : callable
+            called with the GenerationStats record after each generation
+        csv_path : str
+            path of the CSV file the records are appended to
+        json_path : str
+            path of the JSON Lines file the records are appended to
+        profile_generation : int
+            index of the generation profiled with cProfile
+        profile_path : str
+            path of the profile statistics file (see pstats), if None the
+            statistics are printed
+        """
+        self.callback = callback
+        self.csv_path = csv_path
+        self.json_path = json_path
+        self.profile_generation = profile_generation
+        self.profile_path = profile_path
+        self.records = []
+        self.current = None
+
+    @contextlib.contextmanager
+    def generation(self, generation_index):
+        """
+        Context of a generation's run, emits its record at exit
+        """
+        self.current = GenerationStats(generation_index)
+        profiler = None
+        if generation_index == self.profile_generation:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield self.current
+        finally:
+            self.current.total_time = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                self.dump_profile(profiler)
+        self.emit(self.current)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context of a phase, its wall-clock time is added to the record of
+        the current generation
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                self.current.times[name] += time.perf_counter() - start
+
+    def count_race(self, results, buoy_count, max_ticks, ticks=None, 
+                   ship_ticks=None, retired=0, cached=0):
+        """
+        Updates the counters of the current generation by a race's results
+        (curr_buoy_index, min_distance and time of each ship) and the number
+        of retired and cached (not simulated) ships
+        If the simulated ticks and ship ticks are not given they are derived
+        from the results, assuming ships are simulated until they finish or
+        the race ends
+        """
+        if self.current is None:
+            return
+        curr_buoy_index, _, finish_time = results
+        finished = curr_buoy_index >= buoy_count
+        if ship_ticks is None:
+            ship_ticks = int(np.where(finished, finish_time + 1, 
+                                      max_ticks).sum())
+        if ticks is None:
+            if finished.all():
+                ticks = int(finish_time.max()) + 1
+            else:
+                ticks = max_ticks
+        self.current.races += 1
+        self.current.ticks_simulated += ticks
+        self.current.ship_ticks_simulated += ship_ticks
+        self.current.ships_finished_early += int(finished.sum())
+        self.current.ships_retired += retired
+        self.current.ships_cached += cached
+        self.current.ticks_skipped += max_ticks - ticks
+
+    def emit(self, stats):
+        """
+        Passes the record to the callback and appends it to the files
+        """
+        self.records.append(stats)
+        record = stats.as_dict()
+        if self.callback is not None:
+            self.callback(stats)
+        if self.csv_path is not None:
+            new_file = (not os.path.exists(self.csv_path) or
+                        os.path.getsize(self.csv_path) == 0)
+            with open(self.csv_path, 'a', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=list(record))
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(record)
+        if self.json_path is not None:
+            with open(self.json_path, 'a') as file:
+                file.write(json.dumps(record) + '\n')
+
+    def dump_profile(self, profiler):
+        import pstats
+        if self.profile_path is not None:
+            profiler.dump_stats(self.profile_path)
+        else:
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
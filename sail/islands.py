@@ -0,0 +1,159 @@
+import numpy as np
+from .log import QUIET, SimulationLog
+from .simulator import Simulator, INIT_STREAM
+from .model_pack import Population
+
+
+class IslandSimulator(Simulator):
+    """
+    Headless simulator of a single island of the island model
+    Every random stream of the island is keyed by the island index as well,
+    thus the islands start from different populations and race on
+    different tracks
+    """
+    def __init__(self, island, **kwargs):
+        self.island = island
+        # the islands run simultaneously, their output is not written
+        super().__init__(headless=True, batch_races=True, 
+                         log=SimulationLog(QUIET), **kwargs)
+        # generation index, test distance and genome of each outstanding
+        # test result, saved by the main process
+        self.outstanding = []
+
+    def generator(self, *key):
+        return super().generator(*key, self.island)
+
+    def save_outstanding(self, generation_index, distance, genome=None):
+        if genome is None:
+            genome = self.model.population.genomes[0]
+        self.outstanding.append((generation_index, distance, genome.copy()))
+
+
+def evolve_island(name, shape, island, config, start, stop):
+    """
+    Evolves the population of an island for the generations [start, stop)
+    (runs in worker processes)
+    The genomes of the island are read from and written back to its slot
+    of the shared memory block
+    Parameters
+    name : str
+        name of the shared memory block of the genomes of all islands
+    shape : tuple
+        shape of the genome array (islands, population, genome size)
+    config : dict
+        parameters of the island's :class:`IslandSimulator`
+    Returns
+    tuple
+        test results, instrumentation records and outstanding test results
+        (generation index, test distance and genome) of the generations
+    """
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        genomes = np.ndarray(shape, dtype='float64', buffer=block.buf)
+        sim = IslandSimulator(island, **config)
+        sim.model.population.genomes = genomes[island].copy()
+        for i in range(start, stop):
+            with sim.instrumentation.generation(i):
+                sim.run_generation(i)
+        genomes[island] = sim.model.population.genomes
+        del genomes
+    finally:
+        block.close()
+    return (sim.test_results[start:stop], sim.instrumentation.records,
+            sim.outstanding)
+
+
+class IslandModel:
+    """
+    Island model of the evolution
+    Several populations (islands) evolve independently in parallel worker
+    processes, after every migration_interval generations the elite of
+    each island migrates to the next island (ring topology) replacing its
+    last ships
+    The genomes of all islands are kept in a shared memory block, so only
+    the island indices are sent to the workers and the migration is an
+    in-place copy
+    """
+    def __init__(self, simulator, islands, migration_interval,
+                 migrant_count):
+        """
+        Parameters
+        simulator : Simulator
+            simulator of the evolution (provides the parameters)
+        islands : int
+            number of islands (worker processes)
+        migration_interval : int
+            number of generations between two migrations
+        migrant_count : int
+            number of migrating ships of each island (at most the elite
+            count of the population)
+        """
+        # the process pool and shared memory machinery is only imported
+        # when used
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrant_count = migrant_count
+        self.config = {'nn_architecture': simulator.nn_architecture[1:-1],
+                       'generation_count': simulator.generation_count,
+                       'population_size': simulator.population_size,
+                       'mutation_rate': simulator.mutation_rate,
+                       'random_race': simulator.random_race,
+                       'race_count': simulator.race_count,
+                       'fixed_tracks': simulator.fixed_tracks,
+                       'seed': simulator.seed,
+                       'retirement': simulator.retirement,
+                       'precision': simulator.precision,
+                       'polar': simulator.polar}
+
+        population = simulator.model.population
+        self.shape = (islands,) + population.genomes.shape
+        self.block = shared_memory.SharedMemory(
+                        create=True, size=int(np.prod(self.shape)) * 8)
+        self.genomes = np.ndarray(self.shape, dtype='float64',
+                                  buffer=self.block.buf)
+        for island in range(islands):
+            # same initialization as the island's own simulator
+            self.genomes[island] = Population(
+                        simulator.nn_architecture, simulator.population_size,
+                        simulator.generator(INIT_STREAM, island)).genomes
+        self.executor = ProcessPoolExecutor(max_workers=islands)
+
+    def evolve(self, start, stop):
+        """
+        Evolves all islands for the generations [start, stop) in parallel
+        Returns
+        tuple
+            test results (islands x generations array), instrumentation
+            records (list of each island's records) and the outstanding 
+            test results of all islands (generation index, test distance 
+            and genome tuples, see :func:`evolve_island`)
+        """
+        futures = [self.executor.submit(evolve_island, self.block.name,
+                                        self.shape, island, self.config,
+                                        start, stop)
+                   for island in range(self.islands)]
+        results = [future.result() for future in futures]
+        test_results = np.array([r for r, _, _ in results])
+        outstanding = [result for _, _, island_outstanding in results
+                       for result in island_outstanding]
+        return (test_results, [records for _, records, _ in results],
+                outstanding)
+
+    def migrate(self):
+        """
+        Copies the elite of each island over the last ships of the next
+        island
+        The elite is the beginning of the evolved genomes, the best ship
+        being the first one
+        """
+        migrants = self.genomes[:, 0:self.migrant_count].copy()
+        self.genomes[:, -self.migrant_count:] = np.roll(migrants, 1, axis=0)
+
+    def close(self):
+        self.executor.shutdown()
+        del self.genomes
+        self.block.close()
+        self.block.unlink()
@@ -0,0 +1,184 @@
+"""
+Batch evaluation of saved neural networks
+
+Loads every neural network saved by :func:`~neural_network.NeuralNetwork.save`
+from a directory (or the best ones of a :class:`~archive.GenomeArchive` file)
+and ranks them headless on the test track and the standard race tracks, 
+e.g.::
+
+    python -m sail.leaderboard simulation_results --output leaderboard.csv
+    python -m sail.leaderboard results.sga --archived 100
+
+The networks of the same architecture are stacked into one population and
+simulated on all the tracks at once
+"""
+import argparse
+import csv
+import glob
+import os
+import numpy as np
+from .model_pack import GenomeArchive, Model, NeuralNetwork, simulate_races
+from .simulator import MAX_TICKS
+
+# standard race tracks the networks are scored on besides the test track
+STANDARD_RACES = (1, 2, 3)
+
+
+def load_networks(directory):
+    """
+    Loads the neural networks of the .npz files of the directory
+    Returns
+    list of tuples
+        path, weights and biases of each neural network in the order of
+        the file names
+    """
+    networks = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.npz'))):
+        nn = NeuralNetwork([])
+        nn.load(path)
+        # parameters of equal shapes are loaded as object arrays
+        weights = [np.asarray(w, dtype='float64') for w in nn.weights]
+        biases = [np.asarray(b, dtype='float64') for b in nn.biases]
+        networks.append((path, weights, biases))
+    return networks
+
+
+def load_archive(path, count=None):
+    """
+    Loads the neural networks of the given number of the longest test
+    distances from a genome archive (all of them if None)
+    Returns
+    list of tuples
+        label (path#entry index), weights and biases of each neural network
+        in the order of their test distances
+    """
+    archive = GenomeArchive(path)
+    networks = []
+    for i in archive.top(len(archive) if count is None else count):
+        nn = archive.load(i)
+        networks.append(('{}#{}'.format(path, i), nn.weights, nn.biases))
+    return networks
+
+
+def group_by_architecture(networks):
+    """
+    Groups the loaded neural networks by their architecture
+    Returns
+    dict
+        indices of the networks of each architecture (tuple)
+    """
+    groups = {}
+    for i, (_, weights, _) in enumerate(networks):
+        architecture = tuple([w.shape[0] for w in weights] +
+                             [weights[-1].shape[1]])
+        groups.setdefault(architecture, []).append(i)
+    return groups
+
+
+def make_races(seed=0):
+    """
+    Returns the test race and the standard races (buoys, wind and start
+    position tuples), the start orientations of the standard races are
+    drawn from a generator of the given seed, thus every network sails the
+    same races
+    """
+    rng = np.random.default_rng(seed)
+    return [Model.make_test_race()] + [Model.make_race(False, race_number,
+                                                       rng)
+                                       for race_number in STANDARD_RACES]
+
+
+def evaluate(networks, races, ticks=MAX_TICKS):
+    """
+    Simulates every neural network in all the races, the networks of each
+    architecture in one vectorized pass
+    Returns
+    list of tuples
+        curr_buoy_index, min_distance and time arrays of each race in the
+        order of the networks
+    """
+    count = len(networks)
+    results = [(np.zeros(count, dtype='int64'), np.zeros(count), 
+                np.zeros(count, dtype='int64')) for _ in races]
+    for indices in group_by_architecture(networks).values():
+        weights = [np.stack(w) for w in zip(*(networks[i][1] 
+                                              for i in indices))]
+        biases = [np.stack(b) for b in zip(*(networks[i][2] 
+                                             for i in indices))]
+        group_results = simulate_races(weights, biases, races, ticks)
+        for race_results, group_race_results in zip(results, group_results):
+            for array, values in zip(race_results, group_race_results):
+                array[indices] = values
+    return results
+
+
+def leaderboard(networks, results):
+    """
+    Ranks the neural networks by their results
+    The networks are ordered in each race the same way as by the 
+    evaluation of the evolution (see :func:`~population.Population.evaluate`)
+    and the leaderboard is ordered by the sum of their places, ties are 
+    broken by the distance sailed on the test track
+    Returns
+    list of dictionaries
+        one row per network, the best one first
+    """
+    places = np.zeros(len(networks), dtype='int64')
+    for curr_buoy_index, min_distance, time in results:
+        order = np.lexsort((time, min_distance, -curr_buoy_index))
+        places[order] += np.arange(len(order))
+    test_distance = Model.test_distance(*results[0][0:2])
+    rows = []
+    for i in np.lexsort((-test_distance, places)):
+        path, weights, _ = networks[i]
+        architecture = [w.shape[0] for w in weights] + [weights[-1].shape[1]]
+        row = {'file': os.path.basename(path),
+               'nn_architecture': str(architecture).replace(' ', ''),
+               'score': int(places[i]),
+               'test_distance': int(test_distance[i])}
+        for race_number, (curr_buoy_index, _, time) in zip(
+                                            STANDARD_RACES, results[1:]):
+            row['buoys_{}'.format(race_number)] = int(curr_buoy_index[i])
+            row['time_{}'.format(race_number)] = int(time[i])
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sail.leaderboard',
+        description='Ranks the saved neural networks of a directory')
+    parser.add_argument('directory', 
+                        help='directory of the .npz files or path of a '
+                             'genome archive')
+    parser.add_argument('--archived', type=int,
+                        help='number of the best archived networks ranked '
+                             '(all if not given)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the start orientations of the races')
+    parser.add_argument('--top', type=int, default=20,
+                        help='number of printed networks')
+    parser.add_argument('--output', help='path of the CSV leaderboard')
+    args = parser.parse_args(argv)
+
+    if os.path.isfile(args.directory):
+        networks = load_archive(args.directory, args.archived)
+    else:
+        networks = load_networks(args.directory)
+    if not networks:
+        raise Exception('No saved neural networks in ' + args.directory)
+    rows = leaderboard(networks, evaluate(networks, make_races(args.seed)))
+    columns = list(rows[0])
+    print(' '.join('{:>14s}'.format(column) for column in columns))
+    for row in rows[0:args.top]:
+        print(' '.join('{:>14s}'.format(str(row[column])) 
+                       for column in columns))
+    if args.output is not None:
+        with open(args.output, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
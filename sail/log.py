@@ -0,0 +1,141 @@
+import json
+import sys
+from .view_pack import LoadingBar
+
+# verbosity levels of the console output, each level includes the former ones
+QUIET = 0        # no console output
+GENERATIONS = 1  # test result of each generation
+RACES = 2        # headers and best results of each race
+PROGRESS = 3     # progress bars of the races
+
+
+class SimulationLog:
+    """
+    Progress and result log of the simulation
+    Messages are written to the console if their level is within the
+    verbosity, the progress bars are rate limited in time, and the results
+    of every race and generation are optionally appended to a JSON Lines
+    file as structured records (independently of the verbosity)
+    """
+    def __init__(self, verbosity=PROGRESS, json_path=None,
+                 progress_interval=0.1, stream=None):
+        """
+        Parameters
+        verbosity : int
+            highest level of the written messages: QUIET, GENERATIONS,
+            RACES or PROGRESS
+        json_path : str
+            path of the JSON Lines file the race and generation records
+            are appended to
+        progress_interval : float
+            minimum time in seconds between two redraws of a progress bar
+            (if None the bar is redrawn at every percent)
+        stream : file object
+            console stream (if None the current sys.stdout)
+        """
+        self.verbosity = verbosity
+        self.json_path = json_path
+        self.progress_interval = progress_interval
+        self.stream = stream
+
+    def write(self, level, *values):
+        """
+        Writes the values separated by spaces as a line if the level is
+        within the verbosity
+        """
+        if level > self.verbosity:
+            return
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write(' '.join(str(value) for value in values) + '\n')
+
+    def record(self, event, **values):
+        """
+        Appends a record of the event to the JSON Lines file
+        """
+        if self.json_path is None:
+            return
+        with open(self.json_path, 'a') as file:
+            file.write(json.dumps(dict(event=event, **values)) + '\n')
+
+    def progress_bar(self, size, message):
+        """
+        Returns a LoadingBar of the given number of steps (None if progress
+        bars are not written)
+        """
+        if self.verbosity < PROGRESS:
+            return None
+        return LoadingBar(size, message, self.progress_interval, self.stream)
+
+    def end_progress(self):
+        """
+        Ends the line of a progress bar
+        """
+        self.write(PROGRESS, '')
+
+    def generation_start(self, generation_index):
+        self.write(RACES, '------------------------------------------')
+        self.write(RACES, generation_index, '.generation')
+
+    def race_start(self, race_number, buoy_count=None):
+        """
+        Writes the header of a race (with its buoy count if random)
+        """
+        self.write(RACES, '- {}. race'.format(race_number))
+        if buoy_count is not None:
+            self.write(RACES, 'Random race, buoy count:', buoy_count)
+
+    def races_start(self, race_count, buoy_counts=()):
+        """
+        Writes the header of the races simulated at once (with the buoy 
+        count of each random race)
+        """
+        self.write(RACES, '- {} races at once'.format(race_count))
+        for buoy_count in buoy_counts:
+            self.write(RACES, 'Random race, buoy count:', buoy_count)
+
+    def race_results(self, generation_index, race_number, results, order,
+                     buoy_count):
+        """
+        Writes the best results of a race (ships ordered by fitness, see
+        :func:`~population.Population.evaluate`) and records the results
+        of its best ship
+        """
+        curr_buoy_index, min_distance, time = results
+        self.write(RACES, 'Best results:')
+        self.write(RACES, '{:<6s} {:<10s} {:<10s}'.format('Buoys', 'Distance',
+                                                          'Time'))
+        for index in order[0:5]:
+            self.write(RACES, '{:<6s} {:<10s} {:<10s}'.format(
+                                            str(curr_buoy_index[index]),
+                                            str(int(min_distance[index])),
+                                            str(time[index])))
+        best = order[0]
+        self.record('race', generation=generation_index, race=race_number,
+                    buoy_count=int(buoy_count),
+                    best_buoys=int(curr_buoy_index[best]),
+                    best_distance=float(min_distance[best]),
+                    best_time=int(time[best]),
+                    finished=int((curr_buoy_index >= buoy_count).sum()),
+                    ships=len(order))
+
+    def test_start(self, generation_index, submitted=False):
+        """
+        Writes the header of a test race (or of its submission to a worker)
+        """
+        if submitted:
+            self.write(RACES, '\nTest of', generation_index, 
+                       '.generation submitted')
+        else:
+            self.write(GENERATIONS, '\nTest of', generation_index, 
+                       '.generation')
+
+    def test_result(self, generation_index, distance):
+        """
+        Writes and records the test distance of a generation
+        """
+        self.write(GENERATIONS, 'Distance sailed on test track:\n{}'.format(
+                                                                int(distance)))
+        if distance > 1800:
+            self.write(GENERATIONS, 'DISTANCE OVER 1800')
+        self.record('generation', generation=generation_index,
+                    test_distance=float(distance))
@@ -1,8 +1,17 @@
+from .archive import GenomeArchive
+from .batch_network import BatchNeuralNetwork
+from .buffered_fleet import BufferedFleet
 from .buoys import Buoys
+from .fleet import Fleet, RetirementPolicy, ShipState
+from .fitness_cache import FitnessCache
+from .genome import GenomeLayout
 from .model import Model
 from .neural_network import NeuralNetwork
+from .parallel import ParallelEvaluator, simulate_races
+from .polar import AnalyticPolar, Polar, TabulatedPolar
 from .population import Population
 from .ship import Ship
+from .tracks import TrackRegistry, register_track_file, tracks
 from .wind import Wind
 
 
@@ -0,0 +1,268 @@
+import hashlib
+import os
+import numpy as np
+from .genome import GenomeLayout
+from .neural_network import NeuralNetwork
+
+# magic of the file header and of the index trailer (format version 1)
+ARCHIVE_MAGIC = b'SAILGA01'
+INDEX_MAGIC = b'SAILIX01'
+HEADER_SIZE = 16
+
+# maximum number of layers of an archived neural network
+MAX_LAYERS = 16
+
+# index entry of a genome, it also precedes the genome in the file, thus
+# the index can be rebuilt by scanning the records (8 byte aligned size)
+ENTRY = np.dtype([('digest', 'V16'),
+                  ('offset', '<u8'),       # byte offset of the genome
+                  ('size', '<u8'),         # number of parameters
+                  ('generation', '<i8'),
+                  ('distance', '<f8'),
+                  ('architecture', '<u4', (MAX_LAYERS,)), # zero padded
+                  ('seed', 'S40')])
+
+# trailer at the end of the file locating the index
+TRAILER = np.dtype([('index_offset', '<u8'), ('count', '<u8'),
+                    ('magic', 'S8')])
+
+
+class GenomeArchive:
+    """
+    Single-file append-only archive of genomes (flat neural network
+    parameters, see :class:`~genome.GenomeLayout`)
+    The file is a header, the records (index entry followed by the float64
+    genome) in the order of appending and the index of all entries with a
+    trailer at the end. Appending first truncates the index and trailer,
+    then writes the new records and the whole index again, so the former
+    records are never modified and an interrupted append leaves no valid
+    trailer (the index is then rebuilt by scanning the records, only the
+    records written completely are kept)
+    The index and the genomes are memory mapped, no object is pickled, and
+    identical genomes (of the same architecture) are stored only once
+    """
+    def __init__(self, path):
+        """
+        Opens the archive of the given path (created if it does not exist)
+        """
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as file:
+                file.write(ARCHIVE_MAGIC.ljust(HEADER_SIZE, b'\0'))
+                self.write_index(file, np.zeros(0, dtype=ENTRY), HEADER_SIZE)
+        self.open()
+
+    def __len__(self):
+        return len(self.index)
+
+    def open(self):
+        """
+        Memory maps the index and the genomes of the file
+        """
+        self._digests = None
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as file:
+            if file.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise Exception('Not a genome archive: ' + self.path)
+            file.seek(max(size - TRAILER.itemsize, 0))
+            trailer = np.frombuffer(file.read(TRAILER.itemsize),
+                                    dtype=TRAILER)
+        if len(trailer) == 0 or trailer['magic'][0] != INDEX_MAGIC:
+            self.recover()
+            return
+        self.records_end = int(trailer['index_offset'][0])
+        count = int(trailer['count'][0])
+        # the index must fill the file between the records and the trailer
+        if (self.records_end < HEADER_SIZE or self.records_end + 
+                count * ENTRY.itemsize + TRAILER.itemsize != size):
+            self.recover()
+            return
+        if count == 0:
+            self.index = np.zeros(0, dtype=ENTRY)
+        else:
+            self.index = np.memmap(self.path, dtype=ENTRY, mode='r',
+                                   offset=self.records_end, shape=(count,))
+        self.data = np.memmap(self.path, dtype='<f8', mode='r')
+
+    def recover(self):
+        """
+        Rebuilds the index of an archive whose last append was interrupted
+        by scanning its records
+        """
+        size = os.path.getsize(self.path)
+        entries = []
+        position = HEADER_SIZE
+        with open(self.path, 'rb') as file:
+            while position + ENTRY.itemsize <= size:
+                file.seek(position)
+                entry = np.frombuffer(file.read(ENTRY.itemsize),
+                                      dtype=ENTRY)[0]
+                end = int(entry['offset']) + int(entry['size']) * 8
+                if (int(entry['offset']) != position + ENTRY.itemsize or
+                        end > size):
+                    break
+                entries.append(entry)
+                position = end
+        index = np.array(entries, dtype=ENTRY)
+        with open(self.path, 'r+b') as file:
+            self.write_index(file, index, position)
+        self.open()
+
+    @staticmethod
+    def write_index(file, index, records_end):
+        """
+        Writes the index and the trailer after the records and truncates
+        the file
+        """
+        file.seek(records_end)
+        file.write(index.tobytes())
+        trailer = np.array([(records_end, len(index), INDEX_MAGIC)],
+                           dtype=TRAILER)
+        file.write(trailer.tobytes())
+        file.truncate()
+        file.flush()
+        os.fsync(file.fileno())
+
+    @staticmethod
+    def digest(nn_architecture, genome):
+        """
+        Returns the digest identifying a genome of the architecture
+        """
+        digest = hashlib.blake2b(np.asarray(nn_architecture,
+                                            dtype='<u4').tobytes(),
+                                 digest_size=16)
+        digest.update(np.ascontiguousarray(genome, dtype='<f8').data)
+        return digest.digest()
+
+    @property
+    def digests(self):
+        """
+        Index of each digest in the archive (built on first access)
+        """
+        if self._digests is None:
+            self._digests = {bytes(digest): i for i, digest
+                             in enumerate(self.index['digest'])}
+        return self._digests
+
+    def append(self, genome, nn_architecture, generation, distance,
+               seed=None):
+        """
+        Appends a genome to the archive unless it is already archived
+        Returns
+        int
+            index of the genome in the archive
+        """
+        return int(self.extend([genome], nn_architecture, [generation],
+                               [distance], seed)[0])
+
+    def extend(self, genomes, nn_architecture, generations, distances,
+               seed=None):
+        """
+        Appends genomes of the same architecture to the archive in one
+        write, genomes already archived (or repeated) are skipped
+        Parameters
+        genomes : numpy array
+            genomes of shape (count, genome size)
+        nn_architecture : list of integers
+            neuron number of each layer in the neural networks
+        generations : list of integers
+            generation of each genome
+        distances : list of floats
+            test distance of each genome
+        seed : int
+            seed of the simulation the genomes evolved in
+        Returns
+        numpy array
+            index of each genome in the archive
+        """
+        genomes = np.asarray(genomes, dtype='<f8')
+        if len(nn_architecture) > MAX_LAYERS:
+            raise Exception('Neural network of more than {} layers'
+                            .format(MAX_LAYERS))
+        if genomes.shape[1] != GenomeLayout(nn_architecture).size:
+            raise Exception('Genome size does not match the architecture')
+        digests = self.digests
+        indices = np.zeros(len(genomes), dtype='int64')
+        new = []
+        new_digests = []
+        for i, genome in enumerate(genomes):
+            digest = self.digest(nn_architecture, genome)
+            if digest in digests:
+                indices[i] = digests[digest]
+                continue
+            digests[digest] = indices[i] = len(self.index) + len(new)
+            new.append(i)
+            new_digests.append(digest)
+        if not new:
+            return indices
+
+        # records of the new genomes, each entry followed by its genome
+        record = np.dtype([('entry', ENTRY),
+                           ('genome', '<f8', (genomes.shape[1],))])
+        records = np.zeros(len(new), dtype=record)
+        entries = records['entry']
+        entries['digest'] = np.array(new_digests, dtype='V16')
+        entries['offset'] = (self.records_end + ENTRY.itemsize +
+                             np.arange(len(new)) * record.itemsize)
+        entries['size'] = genomes.shape[1]
+        entries['generation'] = np.asarray(generations)[new]
+        entries['distance'] = np.asarray(distances)[new]
+        entries['architecture'][:, 0:len(nn_architecture)] = nn_architecture
+        entries['seed'] = b'' if seed is None else str(seed).encode()
+        records['genome'] = genomes[new]
+        index = np.concatenate([np.asarray(self.index), entries])
+        # the memory maps are released before the file is modified
+        self.index = self.data = None
+        with open(self.path, 'r+b') as file:
+            # the former index is invalidated before the records overwrite
+            # it, thus an interrupted append is always recovered
+            file.truncate(self.records_end)
+            file.flush()
+            os.fsync(file.fileno())
+            file.seek(self.records_end)
+            file.write(records.tobytes())
+            self.write_index(file, index, file.tell())
+        self.open()
+        self._digests = digests
+        return indices
+
+    def genome(self, i):
+        """
+        Returns the genome of the i-th entry (read-only memory mapped view)
+        """
+        entry = self.index[i]
+        start = int(entry['offset']) // 8
+        return self.data[start:start + int(entry['size'])]
+
+    def nn_architecture(self, i):
+        """
+        Returns the architecture of the i-th entry's neural network
+        """
+        architecture = self.index['architecture'][i]
+        return architecture[architecture > 0].tolist()
+
+    def top(self, n):
+        """
+        Returns the indices of the n entries of the longest test distance,
+        the best one first (equal distances in the order of the entries)
+        """
+        distance = np.asarray(self.index['distance'])
+        n = min(n, len(distance))
+        if n == 0:
+            return np.zeros(0, dtype='int64')
+        best = np.argpartition(-distance, n - 1)[0:n]
+        return best[np.lexsort((best, -distance[best]))]
+
+    def load(self, i):
+        """
+        Returns the neural network of the i-th entry, its parameters are
+        read-only views of the memory mapped genome
+        """
+        return NeuralNetwork(self.nn_architecture(i), genome=self.genome(i))
+
+    def load_top(self, n):
+        """
+        Returns the neural networks of the n entries of the longest test
+        distance, the best one first
+        """
+        return [self.load(i) for i in self.top(n)]
@@ -0,0 +1,100 @@
+import numpy as np
+
+
+class BatchNeuralNetwork:
+    """
+    The neural networks of a whole population stacked into 3-D tensors
+    Computes the controls of every ship with one batched matrix
+    multiplication per layer
+    """
+    def __init__(self, weights, biases):
+        """
+        Parameters
+        weights : list of numpy arrays
+            weights of each layer, shape (population, in, out)
+        biases : list of numpy arrays
+            biases of each layer, shape (population, out)
+        """
+        self.weights = weights
+        self.biases = biases
+
+    @classmethod
+    def from_networks(cls, nn_population):
+        """
+        Stacks the parameters of a list of NeuralNetwork instances
+        All neural networks must have the same architecture
+        """
+        weights = [np.stack(w) for w in
+                   zip(*[nn.weights for nn in nn_population])]
+        biases = [np.stack(b) for b in
+                  zip(*[nn.biases for nn in nn_population])]
+        return cls(weights, biases)
+
+    def __len__(self):
+        return len(self.weights[0])
+
+    @property
+    def nn_architecture(self):
+        return [self.weights[0].shape[1]] + [w.shape[2] for w in self.weights]
+
+    def take(self, indices):
+        """
+        Returns a BatchNeuralNetwork of the selected neural networks
+        """
+        return BatchNeuralNetwork([w[indices] for w in self.weights],
+                                  [b[indices] for b in self.biases])
+
+    def astype(self, dtype):
+        """
+        Returns the neural networks with parameters of the given dtype
+        (self if the parameters are already of the dtype)
+        """
+        if self.weights[0].dtype == dtype:
+            return self
+        return BatchNeuralNetwork([w.astype(dtype) for w in self.weights],
+                                  [b.astype(dtype) for b in self.biases])
+
+    def predict(self, ship_buoy_angle, wind_angle):
+        """
+        Predicts the controls of all ships by their environment
+        Parameters:
+        - ship_buoy_angle : numpy array - the angles in radians betwween
+                            target buoy and each ship
+        - wind_angle : numpy array - the angles in radians betwween wind
+                       and each ship
+        Returns:
+        - dictionary - contains the controls of the ships as arrays
+        Side effects:
+        - None
+        """
+        # shape (population, 1, in) for batched matmul
+        layer = np.stack((ship_buoy_angle, wind_angle), axis=-1)[:, None, :]
+        for w, b in zip(self.weights, self.biases):
+            layer = np.matmul(layer, w)
+            layer = np.add(layer, b[:, None, :])
+            layer = np.tanh(layer)
+        return {'steer': layer[:, 0, 0]}
+
+    def predict_into(self, inputs, layers):
+        """
+        Predicts the steering controls of all ships into preallocated 
+        buffers, without allocating any arrays
+        Parameters
+        inputs : numpy array
+            ship_buoy_angle and wind_angle of each ship, 
+            shape (population, 1, 2)
+        layers : list of numpy arrays
+            output buffer of each layer, shape (n, 1, out) with 
+            n >= population (only the first population rows are used)
+        Returns
+        numpy array
+            steering controls of the ships (view of the last buffer)
+        """
+        layer = inputs
+        for w, b, out in zip(self.weights, self.biases, layers):
+            out = out[0:len(w)]
+            np.matmul(layer, w, out=out)
+            np.add(out, b[:, None, :], out=out)
+            np.tanh(out, out=out)
+            layer = out
+        return layer[:, 0, 0]
@@ -0,0 +1,184 @@
+import math
+import numpy as np
+from .fleet import Fleet
+
+
+class BufferedFleet(Fleet):
+    """
+    Fleet running the simulation in reduced precision (float32)
+    The state of the ships and the parameters of the neural networks are
+    stored in float32 and every time unit is computed into preallocated
+    work buffers with the out= argument of the ufuncs, thus the per-tick
+    loop allocates no arrays (only finishing or retiring ships, and the
+    retirement policy if any, allocate)
+    Tolerance versus the float64 :class:`~fleet.Fleet`: a single time unit
+    agrees to about 1e-6 relative error (float32 rounding, angles are
+    normalized by a remainder instead of arctan2), but the trajectories are
+    chaotic, so ships whose controls saturate near a decision boundary
+    (e.g. the turning penalty threshold or reaching a buoy) may diverge
+    over a whole race, the results are therefore statistically equivalent
+    rather than identical
+    """
+    dtype = np.float32
+
+    # state arrays stored in the reduced precision
+    _float_fields = ('buoy_x', 'buoy_y', 'wind_orientation', 'x', 'y',
+                     'orientation', 'prev_steer', 'speed', 'min_distance')
+
+    def setup(self, network, races, retirement, elite_count, polar=None):
+        """
+        Initializes the state arrays in the reduced precision and allocates
+        the work buffers of every lane
+        """
+        super().setup(network.astype(self.dtype), races, retirement,
+                      elite_count, polar)
+        for name in BufferedFleet._float_fields:
+            setattr(self, name, getattr(self, name).astype(self.dtype))
+        # flat index of each lane's first buoy in the padded buoy arrays
+        self.flat_buoy_x = self.buoy_x.ravel()
+        self.flat_buoy_y = self.buoy_y.ravel()
+        self.buoy_offset = self.lane_race * self.buoy_x.shape[1]
+
+        size = len(self)
+        self.index_buffer = np.empty(size, dtype='int64')
+        self.offset_buffer = np.empty(size, dtype='int64')
+        self.float_buffers = np.empty((7, size), dtype=self.dtype)
+        self.mask_buffer = np.empty(size, dtype=bool)
+        # inputs and layer outputs of the neural networks
+        self.inputs = np.empty((size, 1, 2), dtype=self.dtype)
+        self.layers = [np.empty((size, 1, w.shape[2]), dtype=self.dtype)
+                       for w in self.lane_network.weights]
+
+    @property
+    def ship_ticks(self):
+        self.sync_lane_ticks()
+        return super().ship_ticks
+
+    def race_counters(self, race):
+        self.sync_lane_ticks()
+        return super().race_counters(race)
+
+    def sync_lane_ticks(self):
+        """
+        Updates the simulated time units of the active lanes, which are not
+        counted in every time unit (each active lane is simulated in every
+        time unit)
+        """
+        self.lane_ticks[self.active] = self.ticks
+
+    def update_active(self):
+        self.sync_lane_ticks()
+        super().update_active()
+
+    def update(self, time):
+        """
+        Calls the neural networks to control the ships which have not
+        finished or retired yet, moves them and analyzes their positions
+        (for details see :func:`~fleet.Fleet.update`)
+        """
+        active = self.active
+        n = active.size
+        if n == 0:
+            return
+        self.ticks += 1
+        x, y, orientation, dx, dy, speed, tmp = self.float_buffers[:, :n]
+        index = self.index_buffer[:n]
+        mask = self.mask_buffer[:n]
+        # the indices are valid, mode='clip' only avoids the buffering of
+        # out by the default mode='raise'
+        np.take(self.x, active, out=x, mode='clip')
+        np.take(self.y, active, out=y, mode='clip')
+        np.take(self.orientation, active, out=orientation, mode='clip')
+
+        # target buoy of each ship
+        self.gather_target(active, index, dx, dy)
+        np.subtract(dx, x, out=dx)
+        np.subtract(dy, y, out=dy)
+
+        # relative angles of the target buoy and the wind (network inputs)
+        inputs = self.inputs[:n]
+        ship_buoy_angle = inputs[:, 0, 0]
+        wind_angle = inputs[:, 0, 1]
+        np.arctan2(dy, dx, out=ship_buoy_angle)
+        np.subtract(ship_buoy_angle, orientation, out=ship_buoy_angle)
+        self.normalize_into(ship_buoy_angle)
+        # gathered into a contiguous buffer, a strided out is buffered
+        np.take(self.wind_orientation, active, out=tmp, mode='clip')
+        np.subtract(tmp, orientation, out=wind_angle)
+        self.normalize_into(wind_angle)
+
+        steer = self.active_network.predict_into(inputs, self.layers)
+
+        # speed relative to the wind and penalty for turning
+        self.polar.speed_into(wind_angle, steer, speed, tmp,
+                              self.offset_buffer[:n], mask)
+
+        # PD controller to prevent oscillation of orientation
+        D = -0.7
+        np.take(self.prev_steer, active, out=tmp, mode='clip')
+        np.subtract(steer, tmp, out=tmp)
+        np.multiply(tmp, D, out=tmp)
+        np.add(steer, tmp, out=tmp)
+        self.prev_steer[active] = tmp
+        np.add(orientation, tmp, out=orientation)
+        self.orientation[active] = orientation
+        self.speed[active] = speed
+
+        # position by speed and orientation
+        np.cos(orientation, out=tmp)
+        np.multiply(tmp, speed, out=tmp)
+        np.add(x, tmp, out=x)
+        self.x[active] = x
+        np.sin(orientation, out=tmp)
+        np.multiply(tmp, speed, out=tmp)
+        np.add(y, tmp, out=y)
+        self.y[active] = y
+
+        # distance of the target buoy
+        self.gather_target(active, index, dx, dy)
+        np.subtract(dx, x, out=dx)
+        np.subtract(dy, y, out=dy)
+        distance = np.hypot(dx, dy, out=dx)
+        min_distance = np.take(self.min_distance, active, out=tmp, 
+                               mode='clip')
+        if self.retirement is not None:
+            self.improvement_time[active[distance < min_distance]] = time
+        np.minimum(distance, min_distance, out=min_distance)
+        self.min_distance[active] = min_distance
+        np.less(min_distance, 10, out=mask)
+        changed = False
+        if mask.any():
+            changed = self.reach_buoys(active[mask], time)
+
+        if self.retirement is not None:
+            retired = self.retirement.retire(self, time)
+            if retired.size > 0:
+                self.retired[retired] = True
+                changed = True
+        if changed:
+            self.update_active()
+
+    def gather_target(self, active, index, buoy_x, buoy_y):
+        """
+        Gathers the target buoy coordinates of the active ships into the
+        given buffers
+        """
+        np.take(self.buoy_offset, active, out=index, mode='clip')
+        offset = np.take(self.curr_buoy_index, active,
+                         out=self.offset_buffer[:active.size], mode='clip')
+        np.add(index, offset, out=index)
+        np.take(self.flat_buoy_x, index, out=buoy_x, mode='clip')
+        np.take(self.flat_buoy_y, index, out=buoy_y, mode='clip')
+
+    @staticmethod
+    def normalize_into(angle):
+        """
+        Moves the angles into [-pi,pi) interval in place
+        """
+        np.add(angle, math.pi, out=angle)
+        np.remainder(angle, 2 * math.pi, out=angle)
+        np.subtract(angle, math.pi, out=angle)
+
+
+# fleet of each numerical precision of the simulation
+FLEETS = {'float64': Fleet, 'float32': BufferedFleet}
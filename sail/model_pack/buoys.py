@@ -1,12 +1,12 @@
 import numpy as np
-import pandas as pd
+from .tracks import tracks
 
 
 class Buoys:
     """
     Model of the list of target buoys
     """    
-    def __init__(self, mode):
+    def __init__(self, mode, rng=None):
         """
         Parameters
         mode : str
@@ -15,6 +15,10 @@ class Buoys:
             '1' - standard race route no. 1
             '2' - standard race route no. 2
             '3' - standard race route no. 3
+            any other track registered in :data:`~tracks.tracks`
+        rng : numpy.random.Generator
+            random number generator of 'random' mode
+            (if None a freshly seeded generator is used)
         """
         self.buoys = []
         
@@ -24,23 +28,30 @@ class Buoys:
                 self.buoys.append(_Buoy(x,y))  
                 
         elif mode == 'random':
-            buoy_count = np.random.randint(4,9)
-            print('Random race, buoy count:', buoy_count)            
+            if rng is None:
+                rng = np.random.default_rng()
+            buoy_count = rng.integers(4,9)
             for i in range(buoy_count):
-                x = np.random.uniform(100, 1060)
-                y = np.random.uniform(100, 650)
+                x = rng.uniform(100, 1060)
+                y = rng.uniform(100, 650)
                 self.buoys.append(_Buoy(x,y))
                 
-        elif mode in {'1', '2', '3'}:
-            # pandas dataframe
-            df = pd.read_json('sail/model_pack/buoy_coordinates.json')
-            for buoy_coords in df[mode + '_race']:
-                x = int(buoy_coords['x'])
-                y = int(buoy_coords['y'])
+        elif mode in tracks:
+            # coordinates are parsed only once by the track registry
+            for x, y in tracks[mode].tolist():
                 self.buoys.append(_Buoy(x,y))
                 
         else:
             raise Exception('Invalid mode parameter')
+            
+    @classmethod
+    def from_coords(cls, coords):
+        """
+        Creates the buoys of the given list of (x, y) coordinates
+        """
+        buoys = cls.__new__(cls)
+        buoys.buoys = [_Buoy(x, y) for x, y in coords]
+        return buoys
         
     def __getitem__(self, index):
         return self.buoys[index]
@@ -0,0 +1,79 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of the race results of the genomes
+    A genome's results only depend on its parameters and the races (buoys,
+    wind and start position of each race, the precision of the simulation),
+    so identical genome/scenario pairs need not be simulated again, e.g.
+    identical genomes of a generation (crossover of an elite with itself),
+    or the unchanged elite if the races repeat (the Simulator's fixed 
+    tracks), caching never changes the results
+    Results depending on the whole population (retirement policy) must not
+    be cached
+    """
+    def __init__(self, capacity=10000):
+        """
+        Parameters
+        capacity : int
+            maximum number of cached genome/scenario pairs, the least
+            recently used ones are evicted
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def scenario_key(races, precision):
+        """
+        Returns the digest of the given races (buoys, wind and start
+        position tuples) simulated in the given precision
+        """
+        digest = hashlib.blake2b(precision.encode(), digest_size=16)
+        for buoys, wind, start_position in races:
+            digest.update(np.array([[buoy.x, buoy.y] for buoy in buoys],
+                                   dtype='float64').tobytes())
+            digest.update(np.array([wind.orientation, start_position['x'],
+                                    start_position['y'],
+                                    start_position['orient']],
+                                   dtype='float64').tobytes())
+        return digest.digest()
+
+    @staticmethod
+    def key(genome, scenario):
+        """
+        Returns the cache key of a genome in the scenario (see
+        :func:`scenario_key`)
+        """
+        digest = hashlib.blake2b(scenario, digest_size=16)
+        digest.update(np.ascontiguousarray(genome, dtype='float64').data)
+        return digest.digest()
+
+    def get(self, key):
+        """
+        Returns the cached results of the key (None if not cached)
+        """
+        results = self.entries.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return results
+
+    def put(self, key, results):
+        """
+        Caches the results (curr_buoy_index, min_distance and time of each
+        race) of the key, evicts the least recently used entry if full
+        """
+        self.entries[key] = results
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
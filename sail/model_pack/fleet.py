@@ -0,0 +1,384 @@
+import math
+import numpy as np
+from .polar import DEFAULT_POLAR
+
+
+class Fleet:
+    """
+    Struct-of-arrays model of all ships competing in a race
+    Holds the state of every ship in NumPy arrays and advances the whole
+    fleet in one vectorized step using the same physics as
+    :class:`~ship.Ship`
+    A fleet may also run several races simultaneously, then every neural 
+    network controls one ship (lane) in each race, each race having its own
+    buoys, wind and start position (see :func:`from_races`)
+    """
+    def __init__(self, network, buoys, wind, start_position, 
+                 retirement=None, elite_count=1, polar=None):
+        """
+        Initializes the state arrays of the ships controlled by the given
+        BatchNeuralNetwork, the target buoys and the wind
+        Parameters
+        retirement : RetirementPolicy
+            optional policy retiring ships which stopped improving and 
+            ending the race early (if None ships are simulated until they
+            finish)
+        elite_count : int
+            number of the best ships whose ranking must be settled before 
+            the race may end early
+        polar : Polar
+            speed model of the ships (the default polar if None)
+        """
+        self.setup(network, [(buoys, wind, start_position)], retirement, 
+                   elite_count, polar)
+
+    @classmethod
+    def from_races(cls, network, races, retirement=None, elite_count=1,
+                   polar=None):
+        """
+        Creates a fleet simulating the population in all the given races 
+        at once
+        Parameters
+        network : BatchNeuralNetwork
+            neural networks of the population
+        races : list of tuples
+            buoys, wind and start position of each race
+        Lane race_index * population_size + network_index is the ship of 
+        the network in the race
+        """
+        fleet = cls.__new__(cls)
+        fleet.setup(network, races, retirement, elite_count, polar)
+        return fleet
+
+    def setup(self, network, races, retirement, elite_count, polar=None):
+        """
+        Initializes the state arrays of every lane
+        """
+        self.network = network
+        self.retirement = retirement
+        self.polar = DEFAULT_POLAR if polar is None else polar
+        self.elite_count = elite_count
+        self.population_size = len(network)
+        self.race_count = len(races)
+        self.races = races
+
+        # buoys and wind of the first race (displayed by the views)
+        self.buoys, self.wind, _ = races[0]
+        # buoy coordinates of each race padded to the longest buoy list
+        max_buoy_count = max(len(buoys) for buoys, _, _ in races)
+        self.buoy_x = np.zeros((self.race_count, max_buoy_count))
+        self.buoy_y = np.zeros((self.race_count, max_buoy_count))
+        self.buoy_count = np.zeros(self.race_count, dtype='int64')
+        for race, (buoys, _, _) in enumerate(races):
+            self.buoy_count[race] = len(buoys)
+            self.buoy_x[race, 0:len(buoys)] = [buoy.x for buoy in buoys]
+            self.buoy_y[race, 0:len(buoys)] = [buoy.y for buoy in buoys]
+
+        # race of each lane and the lane arrays of per race values
+        self.lane_race = np.repeat(np.arange(self.race_count), 
+                                   self.population_size)
+        def per_lane(values):
+            return np.repeat(np.array(values, dtype='float64'),
+                             self.population_size)
+        self.wind_orientation = per_lane([wind.orientation 
+                                       for _, wind, _ in races])
+        if self.race_count == 1:
+            self.lane_network = network
+        else:
+            self.lane_network = network.take(
+                        np.tile(np.arange(self.population_size), 
+                                self.race_count))
+
+        size = len(self.lane_race)
+        self.x = per_lane([start['x'] for _, _, start in races])
+        self.y = per_lane([start['y'] for _, _, start in races])
+        # angle in radians
+        self.orientation = per_lane([start['orient'] 
+                                     for _, _, start in races])
+        self.prev_steer = np.zeros(size)
+
+        self.speed = np.zeros(size)
+
+        self.curr_buoy_index = np.zeros(size, dtype='int64')
+        self.min_distance = self.calc_ship_buoy_dist(np.arange(size))
+        self.time = np.zeros(size, dtype='int64')
+        self.finished = np.zeros(size, dtype=bool)
+        self.retired = np.zeros(size, dtype=bool)
+        # last time unit a ship got closer to its target buoy
+        self.improvement_time = np.zeros(size, dtype='int64')
+
+        # ships still racing and their neural networks, only updated when
+        # ships finish or retire
+        self.active = np.arange(size)
+        self.active_network = self.lane_network
+        # number of simulated time units and of each lane
+        self.ticks = 0
+        self.lane_ticks = np.zeros(size, dtype='int64')
+
+    def __getitem__(self, index):
+        return ShipState(self, index)
+
+    def __iter__(self):
+        return (ShipState(self, i) for i in range(len(self)))
+
+    def __len__(self):
+        return len(self.lane_race)
+
+    @property
+    def ship_ticks(self):
+        return int(self.lane_ticks.sum())
+
+    def race_lanes(self, race):
+        """
+        Returns the slice of the lanes of the given race
+        """
+        return slice(race * self.population_size, 
+                     (race + 1) * self.population_size)
+
+    def race_results(self):
+        """
+        Returns curr_buoy_index, min_distance and time arrays of each race
+        in the order of the population
+        """
+        results = []
+        for race in range(self.race_count):
+            lanes = self.race_lanes(race)
+            results.append((self.curr_buoy_index[lanes], 
+                            self.min_distance[lanes], self.time[lanes]))
+        return results
+
+    def race_counters(self, race):
+        """
+        Returns the simulated ticks, ship ticks and the number of retired 
+        ships of the given race
+        """
+        lanes = self.race_lanes(race)
+        return {'ticks': int(self.lane_ticks[lanes].max(initial=0)),
+                'ship_ticks': int(self.lane_ticks[lanes].sum()),
+                'retired': int(self.retired[lanes].sum())}
+
+    @property
+    def done(self):
+        """
+        True if no ship is racing or the retirement policy ended the race
+        """
+        if self.active.size == 0:
+            return True
+        return (self.retirement is not None and 
+                self.retirement.settled(self))
+
+    def update(self, time):
+        """
+        Calls the neural networks to control the ships which have not
+        finished or retired yet, moves them and analyzes their positions
+        """
+        active = self.active
+        if active.size == 0:
+            return
+        self.ticks += 1
+        self.lane_ticks[active] += 1
+        ship_buoy_angle = self.calc_ship_buoy_angle(active)
+        wind_angle = self.calc_ship_wind_angle(active)
+        controls = self.active_network.predict(ship_buoy_angle, wind_angle)
+        self.move(active, controls)
+        changed = self.analyze_position(active, time)
+        if self.retirement is not None:
+            retired = self.retirement.retire(self, time)
+            if retired.size > 0:
+                self.retired[retired] = True
+                changed = True
+        if changed:
+            self.update_active()
+
+    def update_active(self):
+        """
+        Drops the finished and retired ships from the active set
+        """
+        racing = ~(self.finished[self.active] | self.retired[self.active])
+        self.active = self.active[racing]
+        self.active_network = self.lane_network.take(self.active)
+
+    def calc_ship_buoy_angle(self, active):
+        """
+        Calculates target buoy orientations relative to the active ships
+        """
+        race = self.lane_race[active]
+        buoy_index = self.curr_buoy_index[active]
+        angle_buoy = np.arctan2(self.buoy_y[race, buoy_index] - 
+                                self.y[active],
+                                self.buoy_x[race, buoy_index] - 
+                                self.x[active])
+        return self.normalize_angle(angle_buoy - self.orientation[active])
+
+    def calc_ship_wind_angle(self, active):
+        """
+        Calculates wind orientation relative to the active ships
+        """
+        return self.normalize_angle(self.wind_orientation[active] -
+                                    self.orientation[active])
+
+    @staticmethod
+    def normalize_angle(angle):
+        """
+        Moves input angles into [-pi,pi] interval
+        """
+        inside = (-math.pi < angle) & (angle < math.pi)
+        return np.where(inside, angle,
+                        np.arctan2(np.sin(angle), np.cos(angle)))
+
+    def move(self, active, controls):
+        """
+        Updates speed, orientation and position of the active ships due to
+        their current state, the wind and the steering controls
+        (for details see :func:`~ship.Ship.move`)
+        """
+        # Update ship speed relative to the wind
+        # (penalty for turning included)
+        wind_angle = self.calc_ship_wind_angle(active)
+        steer = controls['steer']
+        speed = self.polar.speed(wind_angle, steer)
+
+        # Update orientation by steer
+
+        # PD controller to prevent oscillation of orientation
+        D = -0.7
+        steer = steer + D * (steer - self.prev_steer[active])
+        self.prev_steer[active] = steer
+        orientation = self.orientation[active] + steer
+        self.orientation[active] = orientation
+        self.speed[active] = speed
+
+        # Update position by speed and orientation
+        self.x[active] += speed * np.cos(orientation)
+        self.y[active] += speed * np.sin(orientation)
+
+    def analyze_position(self, active, time):
+        """
+        Calculates distances of the active ships to their target buoy
+        Counts the reached buoys
+        Records the time needed to reach all the buoys
+        Returns True if any ship finished
+        """
+        distance = self.calc_ship_buoy_dist(active)
+        self.improvement_time[active[distance < self.min_distance[active]]] = (
+                                                                        time)
+        min_distance = np.minimum(distance, self.min_distance[active])
+        self.min_distance[active] = min_distance
+        reached = active[min_distance < 10]
+        if reached.size == 0:
+            return False
+        return self.reach_buoys(reached, time)
+
+    def reach_buoys(self, reached, time):
+        """
+        Moves the target of the ships which reached their buoy to the next
+        buoy, records the time of the ships which reached all the buoys
+        Returns True if any ship finished
+        """
+        self.improvement_time[reached] = time
+        self.curr_buoy_index[reached] += 1
+        done = (self.curr_buoy_index[reached] >= 
+                self.buoy_count[self.lane_race[reached]])
+        finished = reached[done]
+        self.finished[finished] = True
+        self.min_distance[finished] = 0
+        self.time[finished] = time
+        next_buoy = reached[~done]
+        self.min_distance[next_buoy] = self.calc_ship_buoy_dist(next_buoy)
+        return finished.size > 0
+
+    def calc_ship_buoy_dist(self, active):
+        """
+        Calculates the target buoy distances from the active ships
+        """
+        race = self.lane_race[active]
+        buoy_index = self.curr_buoy_index[active]
+        return np.sqrt(((self.buoy_x[race, buoy_index] - 
+                         self.x[active]) ** 2) +
+                       ((self.buoy_y[race, buoy_index] - 
+                         self.y[active]) ** 2))
+
+
+class ShipState:
+    """
+    Read-only view of a single ship in a Fleet
+    Provides the attributes of :class:`~ship.Ship` for the views and the
+    evaluation
+    """
+    _fields = {'x', 'y', 'orientation', 'prev_steer', 'speed',
+               'curr_buoy_index', 'min_distance', 'time', 'finished',
+               'retired'}
+
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+
+    def __getattr__(self, name):
+        if name in ShipState._fields:
+            return getattr(self.fleet, name)[self.index].item()
+        raise AttributeError(name)
+
+    @property
+    def buoys(self):
+        return self.fleet.buoys
+
+    @property
+    def wind(self):
+        return self.fleet.wind
+
+
+class RetirementPolicy:
+    """
+    Pruning policy of the races
+    Retires the ships which did not get closer to their target buoy for
+    patience time units and rank behind the elite_count-th best ship of 
+    their race, retired ships keep their current results
+    Retiring is a heuristic trading accuracy for speed: a ship which stopped
+    improving may still overtake the elite later, thus the elite of the 
+    evolution may differ from the one of the unpruned races (even of a 
+    single race)
+    Ends the race as soon as elite_count ships finished, because ships
+    finishing later can not overtake them, thus the elite of this race is
+    settled
+    """
+    def __init__(self, patience=100):
+        """
+        Parameters
+        patience : int
+            number of time units without improvement before a ship may be
+            retired
+        """
+        self.patience = patience
+
+    def retire(self, fleet, time):
+        """
+        Returns the indices of the active ships to be retired
+        Each ship is compared to the k-th best ship of its own race
+        """
+        active = fleet.active
+        stuck = active[time - fleet.improvement_time[active] >= self.patience]
+        if stuck.size == 0:
+            return stuck
+        retired = []
+        for race in np.unique(fleet.lane_race[stuck]):
+            lanes = fleet.race_lanes(race)
+            candidates = stuck[fleet.lane_race[stuck] == race]
+            # k-th best result of the race (same ordering as the evaluation)
+            order = np.lexsort((fleet.time[lanes], fleet.min_distance[lanes],
+                                -fleet.curr_buoy_index[lanes]))
+            kth = lanes.start + order[min(fleet.elite_count, len(order)) - 1]
+            kth_buoy_index = fleet.curr_buoy_index[kth]
+            buoy_index = fleet.curr_buoy_index[candidates]
+            behind = ((buoy_index < kth_buoy_index) |
+                      ((buoy_index == kth_buoy_index) &
+                       (fleet.min_distance[candidates] > 
+                        fleet.min_distance[kth])))
+            retired.append(candidates[behind])
+        return np.concatenate(retired)
+
+    def settled(self, fleet):
+        """
+        True if the ranking of the elite can not change anymore in any race
+        """
+        finished = fleet.finished.reshape(fleet.race_count, -1).sum(axis=1)
+        return bool((finished >= fleet.elite_count).all())
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+class GenomeLayout:
+    """
+    Layout of a neural network's parameters in a flat genome array
+    The weights and biases of each layer are stored one after another, so
+    the parameters of a whole population fit into one contiguous
+    (population x size) array and each layer is a view of it
+    """
+    def __init__(self, nn_architecture):
+        """
+        Calculates the position of each layer's parameters in the genome
+        Parameters
+        nn_architecture : list of integers
+            neuron number of each layer in the neural network
+        """
+        self.nn_architecture = list(nn_architecture)
+        self.weight_slices = []
+        self.bias_slices = []
+        self.shapes = []
+        offset = 0
+        for i in range(len(nn_architecture) - 1):
+            shape = (nn_architecture[i], nn_architecture[i + 1])
+            self.shapes.append(shape)
+            self.weight_slices.append(slice(offset, offset +
+                                            shape[0] * shape[1]))
+            offset += shape[0] * shape[1]
+            self.bias_slices.append(slice(offset, offset + shape[1]))
+            offset += shape[1]
+        self.size = offset
+
+    @classmethod
+    def from_parameters(cls, weights):
+        """
+        Returns the layout of the given list of weight matrices
+        """
+        return cls([w.shape[0] for w in weights] + [weights[-1].shape[1]])
+
+    def weights(self, genomes):
+        """
+        Returns the weights of each layer as views of the genomes
+        (shape (..., in, out) for genomes of shape (..., size))
+        """
+        lead = genomes.shape[:-1]
+        return [genomes[..., s].reshape(lead + shape)
+                for s, shape in zip(self.weight_slices, self.shapes)]
+
+    def biases(self, genomes):
+        """
+        Returns the biases of each layer as views of the genomes
+        (shape (..., out) for genomes of shape (..., size))
+        """
+        return [genomes[..., s] for s in self.bias_slices]
+
+    def pack(self, weights, biases):
+        """
+        Concatenates the given parameters of one neural network into a
+        flat genome
+        """
+        genome = np.empty(self.size)
+        for w, b, ws, bs in zip(weights, biases, self.weight_slices,
+                                self.bias_slices):
+            genome[ws] = np.ravel(w)
+            genome[bs] = b
+        return genome
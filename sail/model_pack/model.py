@@ -9,55 +9,142 @@ class Model:
     """
     Model handles all objects in the simulation
     """
-    def __init__(self, nn_architecture, population_size):
-        self.population = Population(nn_architecture, population_size)
+    def __init__(self, nn_architecture, population_size, rng=None, 
+                 precision='float64', polar=None):
+        """
+        Initializes the population, its neural networks are randomly 
+        initialized by rng (numpy.random.Generator)
+        The simulation runs in the given precision ('float64' or 'float32')
+        with the given speed model of the ships (Polar, the default polar if
+        None)
+        """
+        self.population = Population(nn_architecture, population_size, rng,
+                                     precision, polar)
 
-    def prepare_generation(self, random_race=True, race_number=0):
+    @staticmethod
+    def make_race(random_race=True, race_number=0, rng=None):
         """
-        Randomly initializes ship start postitions, wind direction 
-        and buoy positions at start of each generation
+        Randomly initializes ship start postition, wind direction 
+        and buoy positions of a race
+        All random values are drawn from rng (numpy.random.Generator, if
+        None a freshly seeded generator is used)
+        Returns
+        tuple
+            buoys, wind and start position of the race
         """
+        if rng is None:
+            rng = np.random.default_rng()
         if random_race:
-            self.buoys = Buoys(mode='random')        
-            self.wind = Wind(random=True)        
-            start_position = {'x': np.random.uniform(100, 1060), 
-                              'y': np.random.uniform(100, 650), 
-                              'orient': np.random.uniform(0, 2 * math.pi)}
+            buoys = Buoys(mode='random', rng=rng)        
+            wind = Wind(random=True, rng=rng)        
+            start_position = {'x': rng.uniform(100, 1060), 
+                              'y': rng.uniform(100, 650), 
+                              'orient': rng.uniform(0, 2 * math.pi)}
         else:
-            self.buoys = Buoys(mode=str(race_number))
+            buoys = Buoys(mode=str(race_number))
             wind_orients = {1 : 0, 2 : math.pi / 4, 3: math.pi / 2}
-            self.wind = Wind(random=False, 
-                             orientation=wind_orients[race_number])
-            ship_orient = np.random.uniform(0, 0.2) * math.pi
+            wind = Wind(random=False, orientation=wind_orients[race_number])
+            ship_orient = rng.uniform(0, 0.2) * math.pi
             start_position = {'x': 275, 'y': 100, 'orient': ship_orient}
             # start_position = {'x': 275, 'y': 100, 'orient': 0.18}
-            
+        return buoys, wind, start_position
+
+    def prepare_generation(self, random_race=True, race_number=0, rng=None,
+                           retirement=None, cache=None):
+        """
+        Randomly initializes ship start postitions, wind direction 
+        and buoy positions at start of each generation
+        (for details see :func:`make_race`)
+        The optional retirement policy (RetirementPolicy) may retire ships 
+        and end the race early, the optional FitnessCache skips the 
+        simulation of the cached ships
+        """
+        self.buoys, self.wind, self.start_position = self.make_race(
+                                            random_race, race_number, rng)
+        self.races = [(self.buoys, self.wind, self.start_position)]
         self.population.prepare_generation(self.buoys, self.wind, 
-                                           start_position) 
+                                           self.start_position, retirement,
+                                           cache) 
+        
+    def prepare_races(self, random_race, race_numbers, rngs, 
+                      retirement=None, cache=None):
+        """
+        Initializes all races of a generation to be simulated at once
+        Each race is made by :func:`make_race` from its race number and 
+        random number generator
+        """
+        self.races = [self.make_race(random_race, race_number, rng) 
+                      for race_number, rng in zip(race_numbers, rngs)]
+        self.buoys, self.wind, self.start_position = self.races[0]
+        self.population.prepare_races(self.races, retirement, cache)
+        
+    @staticmethod
+    def make_test_race():
+        """
+        Returns the buoys, wind and start position of the test race
+        """
+        buoys = Buoys(mode='test')
+        wind = Wind(random=False, orientation=0)       
+        start_position = {'x': 275, 'y': 100, 'orient': 0.18}    
+        return buoys, wind, start_position
+        
+    @staticmethod
+    def test_distance(curr_buoy_index, min_distance):
+        """
+        Returns the distance sailed on the test track by the ships of the 
+        given results (2200 if all the buoys are reached)
+        """
+        return np.where(np.asarray(curr_buoy_index) == 4, 2200,
+                        550 * (np.asarray(curr_buoy_index) + 1) - 
+                        np.asarray(min_distance))
         
     def prepare_test(self):
         """
         Initializes ship start postition, wind direction and buoy positions 
         for testing
         """        
-        self.buoys = Buoys(mode='test')
-        
-        self.wind = Wind(random=False, orientation=0)       
-        
-        start_position = {'x': 275, 'y': 100, 'orient': 0.18}    
-        self.population.prepare_test(self.buoys, self.wind, start_position)
+        self.buoys, self.wind, self.start_position = self.make_test_race()
+        self.races = [(self.buoys, self.wind, self.start_position)]
+        self.population.prepare_test(self.buoys, self.wind, 
+                                     self.start_position)
         
     def update(self, time):
         self.population.update(time)
         
-    def evaluate(self):
-        self.population.evaluate()
+    def run_race(self, evaluator):
+        """
+        Simulates the prepared race on the given ParallelEvaluator
+        """
+        return self.run_races(evaluator)[0]
+        
+    def run_races(self, evaluator):
+        """
+        Simulates all prepared races on the given ParallelEvaluator
+        """
+        network = self.population.network
+        if len(network) == 0:
+            # every ship's results are cached
+            race_results = [(np.zeros(0, dtype='int64'), np.zeros(0), 
+                             np.zeros(0, dtype='int64'))] * len(self.races)
+        else:
+            race_results = evaluator.run_races(network, self.races)
+        return self.population.merge_results(race_results)
+        
+    def results(self):
+        return self.population.results()
+        
+    def race_results(self):
+        return self.population.merge_results(
+                                    self.population.fleet.race_results())
+        
+    def evaluate(self, results=None):
+        return self.population.evaluate(results)
         
-    def evolve(self, mutation_rate):
-        self.population.evolve(mutation_rate)
+    def evolve(self, mutation_rate, rng=None):
+        self.population.evolve(mutation_rate, rng)
         
-    def save(self, generation, distance):
-        self.population.save(generation, distance)
+    def save(self, generation, distance, genome=None):
+        self.population.save(generation, distance, genome)
         
     def load(self, filename):
         self.population.load(filename)
@@ -1,22 +1,36 @@
 import numpy as np
+from .genome import GenomeLayout
 
 
 class NeuralNetwork:
     """
     The neural network which controls the ship
     """    
-    def __init__(self, nn_architecture):
+    def __init__(self, nn_architecture, rng=None, genome=None):
         """
         Randomly initializes the neural network parameters
         The layers of the network are hard-coded
+        Parameters:
+        - rng : numpy.random.Generator - random number generator of the 
+                initialization (if None a freshly seeded generator is used)
+        - genome : numpy array - flat parameter array, if given the weights
+                   and biases are views of it instead of random values
+                   (see :class:`~genome.GenomeLayout`)
         """  
         self.nn_architecture = nn_architecture
+        self.rank = 0
+        if genome is not None:
+            layout = GenomeLayout(nn_architecture)
+            self.weights = layout.weights(genome)
+            self.biases = layout.biases(genome)
+            return
+        if rng is None:
+            rng = np.random.default_rng()
         self.weights = []
         self.biases = []
         for i in range(len(nn_architecture) - 1):
-            self.weights.append(np.random.uniform(-0.1, 0.1, size=(nn_architecture[i], nn_architecture[i+1])))
-            self.biases.append(np.random.uniform(-0.1, 0.1, size=nn_architecture[i + 1]))
-        self.rank = 0
+            self.weights.append(rng.uniform(-0.1, 0.1, size=(nn_architecture[i], nn_architecture[i+1])))
+            self.biases.append(rng.uniform(-0.1, 0.1, size=nn_architecture[i + 1]))
             
     def predict(self, ship_buoy_angle, wind_angle):
         """
@@ -37,21 +51,25 @@ class NeuralNetwork:
             layer = np.tanh(layer)
         return {'steer': layer[0]}
             
-    def mutate(self, mutation_rate):
+    def mutate(self, mutation_rate, rng=None):
         """
         Mutates the neural network by multiplying all the weights and biases
         with a random number around 1 and between the percentage values
         Parameters:
         - percentage : int - specifies the magnitude of mutation in percentage
+        - rng : numpy.random.Generator - random number generator of the 
+                mutation (if None a freshly seeded generator is used)
         Returns:
         - None
         Side effects:
         - Updates all values of self.weights and self.biases
         """
+        if rng is None:
+            rng = np.random.default_rng()
         r = 1 - (mutation_rate / 100)
         for w, b in zip(self.weights, self.biases):
-            w *= np.random.uniform(r, 1/r, size=w.shape)
-            b *= np.random.uniform(r, 1/r, size=b.shape)
+            w *= rng.uniform(r, 1/r, size=w.shape)
+            b *= rng.uniform(r, 1/r, size=b.shape)
             
     def crossover(self, nn):
         """
@@ -64,8 +82,8 @@ class NeuralNetwork:
         """
         parameters = zip(self.weights, nn.weights, self.biases, nn.biases)
         for w0, w1, b0, b1 in parameters:
-            w0 = (w0 + w1) / 2
-            b0 = (b0 + b1) / 2
+            w0[...] = (w0 + w1) / 2
+            b0[...] = (b0 + b1) / 2
             
     def save(self, generation, distance):
         """
@@ -76,8 +94,18 @@ class NeuralNetwork:
                     + str(generation) + '_' + str(int(distance)) + '.npz')        
         np.savez_compressed(filename,
                             nn_architecture=np.array(self.nn_architecture),
-                            weights=np.array(self.weights), 
-                            biases=np.array(self.biases))
+                            weights=self.object_array(self.weights), 
+                            biases=self.object_array(self.biases))
+        
+    @staticmethod
+    def object_array(arrays):
+        """
+        Returns a 1-D object array of the given arrays (np.array would 
+        stack or fail to broadcast arrays of equal leading dimensions)
+        """
+        result = np.empty(len(arrays), dtype=object)
+        result[:] = list(arrays)
+        return result
         
     def load(self, filename):
         """
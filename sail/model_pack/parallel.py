@@ -0,0 +1,109 @@
+import numpy as np
+from .batch_network import BatchNeuralNetwork
+from .buffered_fleet import FLEETS
+
+
+def simulate_races(weights, biases, races, ticks=1000, precision='float64',
+                   polar=None):
+    """
+    Simulates races of the ships controlled by the given stacked neural 
+    network parameters at once (runs in worker processes)
+    Parameters
+    races : list of tuples
+        buoys, wind and start position of each race
+    precision : str
+        numerical precision of the simulation, 'float64' or 'float32'
+    polar : Polar
+        speed model of the ships (the default polar if None)
+    Returns
+    list of tuples of numpy arrays
+        curr_buoy_index, min_distance and time of each ship in each race
+    """
+    fleet = FLEETS[precision].from_races(BatchNeuralNetwork(weights, biases),
+                                         races, polar=polar)
+    for t in range(ticks):
+        fleet.update(t)
+        # stop simulation if all ships reached all the targets
+        if fleet.done:
+            break
+    return fleet.race_results()
+
+
+class ParallelEvaluator:
+    """
+    Shards the ships of a race across a pool of worker processes
+    Every ship is simulated independently of the others and the race is
+    prepared in the main process, so the results do not depend on the
+    number of workers
+    """
+    def __init__(self, workers, precision='float64', polar=None):
+        """
+        Parameters
+        workers : int
+            number of worker processes
+        precision : str
+            numerical precision of the simulation, 'float64' or 'float32'
+        polar : Polar
+            speed model of the ships (the default polar if None), sent to 
+            the workers with every shard
+        """
+        # the process pool machinery is only imported when used
+        from concurrent.futures import ProcessPoolExecutor
+        self.workers = workers
+        self.precision = precision
+        self.polar = polar
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+
+    def run_race(self, network, buoys, wind, start_position):
+        """
+        Simulates a race of the given BatchNeuralNetwork's ships
+        Returns
+        tuple of numpy arrays
+            curr_buoy_index, min_distance and time of each ship in the
+            order of the network's population
+        """
+        return self.run_races(network, [(buoys, wind, start_position)])[0]
+
+    def run_races(self, network, races):
+        """
+        Simulates all the given races (buoys, wind and start position 
+        tuples) of the given BatchNeuralNetwork's ships, each worker 
+        simulates its shard of the population in every race at once
+        Only the compact weight and bias arrays of each shard are sent to
+        the workers
+        Returns
+        list of tuples of numpy arrays
+            curr_buoy_index, min_distance and time of each ship in the
+            order of the network's population for each race
+        """
+        shards = np.array_split(np.arange(len(network)), self.workers)
+        futures = []
+        for shard in shards:
+            if shard.size == 0:
+                continue
+            s = slice(shard[0], shard[-1] + 1)
+            futures.append(self.executor.submit(
+                simulate_races, [w[s] for w in network.weights],
+                [b[s] for b in network.biases], races, 
+                precision=self.precision, polar=self.polar))
+        shard_results = [future.result() for future in futures]
+        # concatenate the shards' results of each race
+        return [tuple(np.concatenate(r) for r in zip(*race_results))
+                for race_results in zip(*shard_results)]
+
+    def submit_races(self, network, races, ticks=1000):
+        """
+        Submits the simulation of all the given races of the given 
+        BatchNeuralNetwork's ships to a single worker without waiting for
+        it (e.g. the test race overlapping the next generation)
+        Returns
+        concurrent.futures.Future
+            its result is the list of the curr_buoy_index, min_distance and
+            time arrays of each race
+        """
+        return self.executor.submit(simulate_races, network.weights, 
+                                    network.biases, races, ticks, 
+                                    self.precision, self.polar)
+
+    def close(self):
+        self.executor.shutdown()
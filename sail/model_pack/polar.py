@@ -0,0 +1,171 @@
+import abc
+import math
+import numpy as np
+
+
+class Polar(abc.ABC):
+    """
+    Speed model of the ships (boat polar)
+    Gives the speed of a ship by its angle to the wind, which is symmetric,
+    thus only the absolute angle in [0, pi] is used, and halves the speed
+    of the turning ships
+    The wind angle of the simulation is the angle between the direction
+    the wind blows to and the heading of the ship: 0 is running downwind,
+    pi is sailing head to wind (the true wind angle of sailors is pi minus
+    this angle)
+    Evaluated vectorized over many ships (scalars are also accepted)
+    Subclasses define :func:`boat_speed` (and optionally the allocation 
+    free :func:`boat_speed_into`)
+    """
+    def __init__(self, turn_threshold=0.1, turn_factor=0.5):
+        """
+        Parameters
+        turn_threshold : float
+            steering above which the turning penalty is applied
+        turn_factor : float
+            speed multiplier of the turning ships
+        """
+        self.turn_threshold = turn_threshold
+        self.turn_factor = turn_factor
+
+    @abc.abstractmethod
+    def boat_speed(self, wind_angle):
+        """
+        Returns the speed of ships sailing straight at the given absolute
+        wind angles
+        """
+
+    def boat_speed_into(self, wind_angle, out, work, index):
+        """
+        Computes the speed of ships sailing straight at the given absolute
+        wind angles into out, the work buffers (float and int64 arrays of
+        the size of out) may be used to avoid allocations
+        """
+        out[...] = self.boat_speed(wind_angle)
+
+    def speed(self, wind_angle, steer):
+        """
+        Returns the speed of the ships by their relative wind angles in
+        [-pi, pi] and their steering
+        """
+        speed = self.boat_speed(np.abs(wind_angle))
+        return np.where(np.abs(steer) > self.turn_threshold,
+                        speed * self.turn_factor, speed)
+
+    def speed_into(self, wind_angle, steer, out, work, index, mask):
+        """
+        Computes the speed of the ships into out without allocating arrays
+        (for the buffers see :func:`boat_speed_into`, mask is a boolean
+        buffer)
+        """
+        np.abs(wind_angle, out=work)
+        self.boat_speed_into(work, out, work, index)
+        np.abs(steer, out=work)
+        np.greater(work, self.turn_threshold, out=mask)
+        np.multiply(out, self.turn_factor, out=out, where=mask)
+
+    def tabulate(self, resolution=1024):
+        """
+        Returns the polar as a lookup table of the given resolution
+        """
+        angles = np.linspace(0, math.pi, resolution + 1)
+        return TabulatedPolar(angles, self.boat_speed(math.pi - angles), 
+                              resolution, self.turn_threshold, 
+                              self.turn_factor)
+
+
+def piecewise_linear_speed(wind_angle):
+    """
+    The original speed model: piecewise linear in the wind angle from 20
+    (0, running downwind) to 0 (pi, head to wind), the slope is doubled
+    below the speed of 8
+    """
+    speed = 12 * (math.pi - wind_angle) / math.pi
+    return speed + np.minimum(speed, 8) # speed maximum set to 8
+
+
+class AnalyticPolar(Polar):
+    """
+    Polar defined by a function of the absolute wind angle
+    """
+    def __init__(self, function=piecewise_linear_speed, turn_threshold=0.1,
+                 turn_factor=0.5):
+        """
+        Parameters
+        function : callable
+            speed of a ship sailing straight at the given absolute wind
+            angles of the simulation (numpy array in [0, pi], 0 is running 
+            downwind), must be a module level function for the parallel 
+            evaluation
+        """
+        super().__init__(turn_threshold, turn_factor)
+        self.function = function
+
+    def boat_speed(self, wind_angle):
+        return self.function(wind_angle)
+
+    def boat_speed_into(self, wind_angle, out, work, index):
+        if self.function is not piecewise_linear_speed:
+            out[...] = self.function(wind_angle)
+            return
+        np.subtract(math.pi, wind_angle, out=out)
+        np.multiply(out, 12 / math.pi, out=out)
+        np.minimum(out, 8, out=work)
+        np.add(out, work, out=out)
+
+
+class TabulatedPolar(Polar):
+    """
+    Polar defined by a table of speeds at given true wind angles (the
+    convention of measured boat polars: 0 is head to wind, pi is running
+    downwind)
+    The table is resampled once to a uniform grid of the simulation's wind
+    angle, so the speed of a ship is a linear interpolation between two
+    neighbouring lookup entries
+    """
+    def __init__(self, angles, speeds, resolution=1024, turn_threshold=0.1,
+                 turn_factor=0.5):
+        """
+        Parameters
+        angles : array like
+            increasing true wind angles in radians (in [0, pi], 0 is head
+            to wind)
+        speeds : array like
+            speed of a ship sailing straight at each angle
+        resolution : int
+            number of the intervals of the lookup table
+        """
+        super().__init__(turn_threshold, turn_factor)
+        self.resolution = resolution
+        self.scale = resolution / math.pi
+        grid = np.linspace(0, math.pi, resolution + 1)
+        # the simulation's wind angle is pi minus the true wind angle
+        self.table = np.interp(math.pi - grid, angles, speeds)
+        # slope of each interval (padded, the angle pi has no interval)
+        self.slope = np.append(np.diff(self.table), 0)
+
+    @classmethod
+    def from_degrees(cls, angles, speeds, **kwargs):
+        """
+        Creates the polar of a table whose true wind angles are in degrees
+        """
+        return cls(np.radians(angles), speeds, **kwargs)
+
+    def boat_speed(self, wind_angle):
+        position = np.asarray(wind_angle) * self.scale
+        index = np.clip(position.astype('int64'), 0, self.resolution)
+        return self.table[index] + (position - index) * self.slope[index]
+
+    def boat_speed_into(self, wind_angle, out, work, index):
+        np.multiply(wind_angle, self.scale, out=work)
+        np.copyto(index, work, casting='unsafe')
+        np.clip(index, 0, self.resolution, out=index)
+        np.subtract(work, index, out=work)
+        np.take(self.slope, index, out=out, mode='clip')
+        np.multiply(out, work, out=out)
+        np.take(self.table, index, out=work, mode='clip')
+        np.add(out, work, out=out)
+
+
+# speed model of the simulation if no other polar is given
+DEFAULT_POLAR = AnalyticPolar()
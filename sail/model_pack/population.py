@@ -1,66 +1,209 @@
-import copy
 import numpy as np
-from .ship import Ship
+from .buffered_fleet import FLEETS
+from .genome import GenomeLayout
 from .neural_network import NeuralNetwork
+from .batch_network import BatchNeuralNetwork
 
 
 class Population:
     """
     Population contains all neural networks through the evolution process
-    During simulation Population contains all ship models
+    The parameters of all neural networks are stored in one contiguous 
+    (population x parameters) genome array, the layers of each neural 
+    network are views of it
+    During simulation Population contains the fleet of all ship models
     """    
-    def __init__(self, nn_architecture, population_size):
-        self.nn_population = []  
+    def __init__(self, nn_architecture, population_size, rng=None, 
+                 precision='float64', polar=None):
+        """
+        Parameters
+        precision : str
+            numerical precision of the simulation, 'float64' or 'float32'
+            (see :class:`~buffered_fleet.BufferedFleet`), the genomes are
+            always stored in float64
+        polar : Polar
+            speed model of the ships (the default polar if None)
+        """
+        if rng is None:
+            rng = np.random.default_rng()
         self.population_size = population_size
-        for i in range(population_size):
-            self.nn_population.append(NeuralNetwork(nn_architecture))
+        self.precision = precision
+        self.fleet_class = FLEETS[precision]
+        self.polar = polar
+        # genomes simulated in the current races (None if all of them)
+        self.simulated = None
+        self.layout = GenomeLayout(nn_architecture)
+        self.genomes = rng.uniform(-0.1, 0.1, size=(population_size, 
+                                                    self.layout.size))
+        self.ranks = np.zeros(population_size, dtype='int64')
             
     def __iter__(self):
-        return self.ship_population.__iter__()  
+        return self.fleet.__iter__()  
     
     def __getitem__(self, index):
-        return self.ship_population[index]
+        return self.fleet[index]
     
     def __len__(self):
-        return len(self.ship_population)
+        return len(self.fleet)
+    
+    @property
+    def nn_population(self):
+        """
+        NeuralNetwork instances whose parameters are views of the genomes
+        """
+        nn_population = []
+        for genome, rank in zip(self.genomes, self.ranks):
+            nn = NeuralNetwork(self.layout.nn_architecture, genome=genome)
+            nn.rank = int(rank)
+            nn_population.append(nn)
+        return nn_population
+    
+    def batch_network(self, genomes):
+        """
+        Returns a BatchNeuralNetwork whose parameters are views of the given
+        genomes
+        """
+        return BatchNeuralNetwork(self.layout.weights(genomes), 
+                                  self.layout.biases(genomes))
+    
+    @property
+    def elite_count(self):
+        """
+        Number of the fittest instances selected by the evolution (20%)
+        """
+        return max(int(self.population_size * 0.2), 1)
     
-    def prepare_generation(self, buoys, wind, start_position):
+    def prepare_generation(self, buoys, wind, start_position, 
+                           retirement=None, cache=None):
         self.finished = False
-        self.ship_population = []
-        for nn in self.nn_population:
-            self.ship_population.append(Ship(nn, buoys, wind, start_position))
+        self.select_simulated([(buoys, wind, start_position)], cache)
+        self.fleet = self.fleet_class(self.network, buoys, wind, 
+                                      start_position, retirement, 
+                                      self.elite_count, self.polar)
+            
+    def prepare_races(self, races, retirement=None, cache=None):
+        """
+        Prepares a fleet simulating the population in all the given races
+        (buoys, wind and start position tuples) at once
+        If a FitnessCache is given, only the genomes whose results are not
+        cached are simulated (see :func:`merge_results`)
+        """
+        self.finished = False
+        self.select_simulated(races, cache)
+        self.fleet = self.fleet_class.from_races(self.network, races, 
+                                                 retirement, 
+                                                 self.elite_count,
+                                                 self.polar)
+            
+    def select_simulated(self, races, cache=None):
+        """
+        Selects the genomes to be simulated in the given races and prepares
+        their network
+        The results of the cached genomes are looked up, identical genomes
+        are simulated only once
+        """
+        self.cache = cache
+        if cache is None:
+            self.simulated = None
+            self.network = self.batch_network(self.genomes)
+            return
+        scenario = cache.scenario_key(races, self.precision)
+        self.keys = [cache.key(genome, scenario) for genome in self.genomes]
+        self.cached = {}
+        simulated = {}
+        for i, key in enumerate(self.keys):
+            if key in self.cached or key in simulated:
+                continue
+            results = cache.get(key)
+            if results is None:
+                simulated[key] = i
+            else:
+                self.cached[key] = results
+        self.simulated = np.array(list(simulated.values()), dtype='int64')
+        self.network = self.batch_network(self.genomes[self.simulated])
+        
+    @property
+    def cached_count(self):
+        """
+        Number of ships of the current races which are not simulated
+        """
+        if self.simulated is None:
+            return 0
+        return self.population_size - len(self.simulated)
+        
+    def merge_results(self, race_results):
+        """
+        Completes the results of the simulated genomes by the cached ones
+        and caches the new results
+        Parameters
+        race_results : list of tuples
+            curr_buoy_index, min_distance and time arrays of each race in
+            the order of the simulated genomes
+        Returns
+        list of tuples
+            curr_buoy_index, min_distance and time arrays of each race in 
+            the order of the population
+        """
+        if self.simulated is None:
+            return race_results
+        results = dict(self.cached)
+        for j, i in enumerate(self.simulated):
+            results[self.keys[i]] = [(r[0][j], r[1][j], r[2][j]) 
+                                     for r in race_results]
+            self.cache.put(self.keys[i], results[self.keys[i]])
+        merged = []
+        for race in range(len(next(iter(results.values())))):
+            values = [results[key][race] for key in self.keys]
+            merged.append((np.array([v[0] for v in values], dtype='int64'),
+                           np.array([v[1] for v in values]),
+                           np.array([v[2] for v in values], dtype='int64')))
+        return merged
             
     def prepare_test(self, buoys, wind, start_position):
         self.finished = False
-        self.ship_population = [Ship(self.nn_population[0], buoys, wind, 
-                                     start_position)]
+        self.simulated = None
+        self.network = self.batch_network(self.genomes[0:1])
+        self.fleet = self.fleet_class(self.network, buoys, wind, 
+                                      start_position, polar=self.polar)
         
     def update(self, time):
-        for ship in self.ship_population:
-             ship.update(time)                 
-        self.finished = all([ship.finished for ship in self.ship_population])
+        self.fleet.update(time)
+        self.finished = self.fleet.done
+            
+    def results(self):
+        """
+        Returns the curr_buoy_index, min_distance and time arrays of the
+        current fleet
+        """
+        return (self.fleet.curr_buoy_index, self.fleet.min_distance,
+                self.fleet.time)
             
-    def evaluate(self):
+    def evaluate(self, results=None):
         """
         Orders the list of ships by fitness and updates each ship's rank 
         accordingly
         Fitness is based on the number of buoys reached, the minimum distance
         to the next target buoy and the time neeeded to reach all the buoys
+        Parameters
+        results : tuple of numpy arrays
+            curr_buoy_index, min_distance and time of each ship 
+            (e.g. from a parallel evaluation), if None the results of the 
+            current fleet are used
+        Returns
+        numpy array
+            indices of the ships ordered by fitness in this race
         """
-        ordered_ship_population = sorted(self.ship_population, 
-                   key=lambda x: (-x.curr_buoy_index, x.min_distance, x.time))
+        if results is None:
+            results = self.results()
+        curr_buoy_index, min_distance, time = results
+        # stable ordering, same as sorting by 
+        # (-curr_buoy_index, min_distance, time)
+        order = np.lexsort((time, min_distance, -curr_buoy_index))
         # update rank (the lower the rank the higher the fitness)
-        for rank, ship in enumerate(ordered_ship_population):
-            ship.nn.rank += rank        
-        print('Best results:')
-        print('{:<6s} {:<10s} {:<10s}'.format('Buoys', 'Distance', 'Time'))
-        for ship in ordered_ship_population[0:5]:
-            print('{:<6s} {:<10s} {:<10s}'.format(
-                                            str(ship.curr_buoy_index), 
-                                            str(int(ship.min_distance)), 
-                                            str(ship.time)))
+        self.ranks[order] += np.arange(len(order))
+        return order
             
-    def evolve(self, mutation_rate):
+    def evolve(self, mutation_rate, rng=None):
         """
         Creates the new generation based on the results of the former
         generation's simulation results, using the most fit instances
@@ -72,45 +215,50 @@ class Population:
         Crossover: averaging the parameters of randomly chosen pairs from 
                 the best 20% of the instances
                 (makes up 20% of the next generation's population)
+        All random choices are drawn from rng (numpy.random.Generator, if 
+        None a freshly seeded generator is used)
         """
-        # sort neural network population
-        self.nn_population = sorted(self.nn_population, 
-                                    key=lambda nn: nn.rank)    
+        if rng is None:
+            rng = np.random.default_rng()
+        # sort genomes by rank (stable, as sorted() of the ranks)
+        order = np.argsort(self.ranks, kind='stable')
         # choose the fittest 20%
-        fit_list = self.nn_population[0:int(self.population_size * 0.2)]
+        fit_count = self.elite_count
+        fit_genomes = self.genomes[order[0:fit_count]]
         
-        new_nn_population = []     
+        new_genomes = np.empty_like(self.genomes)
         
         # elitism (20%)
-        for nn in fit_list:
-            new_nn_population.append(nn) 
+        new_genomes[0:fit_count] = fit_genomes
             
         # mutation (60%)
-        for nn in fit_list:
-            for i in range(3):
-                temp_nn = copy.deepcopy(nn)
-                temp_nn.mutate(mutation_rate) 
-                new_nn_population.append(temp_nn)
+        mutants = new_genomes[fit_count:4 * fit_count]
+        mutants[:] = np.repeat(fit_genomes, 3, axis=0)
+        r = 1 - (mutation_rate / 100)
+        mutants *= rng.uniform(r, 1/r, size=mutants.shape)
                 
         # crossover (20%)
-        for nn in fit_list:
-            temp_nn = copy.deepcopy(nn)                
-            temp_nn.crossover(np.random.choice(fit_list)) 
-            new_nn_population.append(temp_nn)
+        partners = rng.integers(fit_count, size=fit_count)
+        new_genomes[4 * fit_count:5 * fit_count] = (
+                                fit_genomes + fit_genomes[partners]) / 2
                 
         # population size of each generation must remain constant
-        assert len(self.nn_population) == len(new_nn_population)
-        self.nn_population = new_nn_population 
+        assert len(self.genomes) == 5 * fit_count
+        self.genomes = new_genomes 
         
         # reset neural networks' rank
-        for nn in self.nn_population:
-            nn.rank = 0
+        self.ranks[:] = 0
             
-    def save(self, generation, distance):
+    def save(self, generation, distance, genome=None):
         """
-        Save best neural network of current generation into .npz file
+        Save best neural network of current generation (or the given 
+        genome) into .npz file
         """
-        self.nn_population[0].save(generation, distance)
+        if genome is None:
+            self.nn_population[0].save(generation, distance)
+        else:
+            NeuralNetwork(self.layout.nn_architecture, 
+                          genome=genome).save(generation, distance)
         
     def load(self, filename):
         """
@@ -118,7 +266,9 @@ class Population:
         """
         nn = NeuralNetwork([])
         nn.load(filename)
-        self.nn_population = [nn]
+        self.layout = GenomeLayout.from_parameters(nn.weights)
+        self.genomes = self.layout.pack(nn.weights, nn.biases)[None, :]
+        self.ranks = np.zeros(1, dtype='int64')
 
         
         
\ No newline at end of file
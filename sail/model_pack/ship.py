@@ -1,14 +1,18 @@
 import math, cmath
+from .polar import DEFAULT_POLAR
 
 
 class Ship:
    
-    def __init__(self, neural_network, buoys, wind, start_position):
+    def __init__(self, neural_network, buoys, wind, start_position, 
+                 polar=None):
         """
         Initializes ship model by setting up the neural network for 
-        controlling the ship, the target buoys and the wind
+        controlling the ship, the target buoys, the wind and the speed 
+        model (polar, the default polar if None)
         """
         self.nn = neural_network
+        self.polar = DEFAULT_POLAR if polar is None else polar
         
         self.buoys = buoys
         self.wind = wind
@@ -76,17 +80,12 @@ class Ship:
           self.x, self.y
         """
         # Update ship speed relative to the wind
+        # (penalty for turning included)
         wind_angle = self.calc_ship_wind_angle()
-        if wind_angle >= 0:
-            self.speed = 12 * (math.pi - wind_angle) / math.pi 
-        else:
-            self.speed = 12 * (wind_angle + math.pi) / math.pi
-        self.speed += min(self.speed, 8) # speed maximum set to 8
+        steer = controls['steer']
+        self.speed = float(self.polar.speed(wind_angle, steer))
         
         # Update orientation by steer
-        steer = controls['steer']
-        if abs(steer) > 0.1: # penalty for turning
-            self.speed /= 2
             
         # A derviative member added to steer thus making a PD controller 
         # to prevent oscillation of orientation around the target angle
@@ -0,0 +1,85 @@
+import json
+import os
+import numpy as np
+
+# coordinate file of the standard race tracks
+STANDARD_TRACKS_FILE = os.path.join(os.path.dirname(__file__), 
+                                    'buoy_coordinates.json')
+
+
+class TrackRegistry:
+    """
+    Registry of the pre-defined race tracks
+    Each track file is parsed only once, the tracks are stored as compact
+    (buoy count x 2) coordinate arrays
+    The standard tracks are loaded on first use
+    """
+    def __init__(self):
+        self.tracks = {}
+        self.standard_loaded = False
+        
+    def __contains__(self, name):
+        self.load_standard()
+        return name in self.tracks
+    
+    def __getitem__(self, name):
+        """
+        Returns the buoy coordinates of the given track
+        """
+        self.load_standard()
+        return self.tracks[name]
+    
+    def names(self):
+        self.load_standard()
+        return list(self.tracks)
+        
+    def load_standard(self):
+        if not self.standard_loaded:
+            self.standard_loaded = True
+            self.register_file(STANDARD_TRACKS_FILE)
+        
+    def register(self, name, coordinates):
+        """
+        Registers a track by its buoy coordinates
+        Parameters
+        name : str
+            name of the track, used as Buoys mode
+        coordinates : array-like
+            x and y coordinates of each buoy in order
+        """
+        coordinates = np.array(coordinates, dtype='float64')
+        if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+            raise Exception('Invalid track coordinates')
+        self.tracks[name] = coordinates
+        
+    def register_file(self, path):
+        """
+        Registers all tracks of a JSON file in the format of 
+        buoy_coordinates.json: {"<name>_race": [{"x": .., "y": ..}, ..]}
+        (the '_race' suffix of the names is omitted)
+        Returns
+        list of str
+            names of the registered tracks
+        """
+        with open(path) as file:
+            content = json.load(file)
+        names = []
+        for key, buoys in content.items():
+            name = key[:-len('_race')] if key.endswith('_race') else key
+            self.register(name, [(float(buoy['x']), float(buoy['y'])) 
+                                 for buoy in buoys])
+            names.append(name)
+        return names
+
+
+# registry used by Buoys
+tracks = TrackRegistry()
+
+
+def register_track_file(path):
+    """
+    Registers the tracks of a JSON file (see 
+    :func:`TrackRegistry.register_file`), registered tracks can be used as
+    Buoys modes
+    """
+    return tracks.register_file(path)
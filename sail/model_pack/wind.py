@@ -4,7 +4,7 @@ import numpy as np
 
 class Wind:
 
-    def __init__(self, random=True, orientation=0):
+    def __init__(self, random=True, orientation=0, rng=None):
         """
         Initializes wind orientation and calculates x and y vectors
         Vectors will be used by View for display wind as arrow grid
@@ -14,9 +14,14 @@ class Wind:
             (if True orientation parameter is omitted)
         orientation : float 
             wind orientation
+        rng : numpy.random.Generator
+            random number generator of random initialization
+            (if None a freshly seeded generator is used)
         """
         if random:
-            self.orientation = np.random.uniform(-math.pi, math.pi)
+            if rng is None:
+                rng = np.random.default_rng()
+            self.orientation = rng.uniform(-math.pi, math.pi)
         else:
             self.orientation = orientation
         self.x = cmath.exp(self.orientation * 1j).real
@@ -1,7 +1,24 @@
+import os
+import threading
 import numpy as np
-import matplotlib.pyplot as plt
-from .model_pack import Model
-from .view_pack import View, LoadingBar
+from .model_pack import (FitnessCache, Model, ParallelEvaluator, 
+                         RetirementPolicy)
+from . import view_pack
+from .instrumentation import GenerationStats, Instrumentation
+from .log import GENERATIONS, SimulationLog
+
+# keys of the independent random streams spawned from the simulation seed
+INIT_STREAM = 0
+RACE_STREAM = 1
+EVOLVE_STREAM = 2
+# races of the fixed tracks shared by every generation (fixed_tracks only)
+TRACK_STREAM = 3
+
+# maximum number of time units of a race
+MAX_TICKS = 1000
+
+# version of the checkpoint file format
+CHECKPOINT_VERSION = 1
 
 
 class Simulator():
@@ -10,7 +27,14 @@ class Simulator():
     Acts as a controller between models and views
     """
     def __init__(self, nn_architecture, generation_count, population_size, 
-                 mutation_rate, random_race=True, race_count=1):
+                 mutation_rate, random_race=True, race_count=1, 
+                 headless=False, workers=1, seed=None, 
+                 instrumentation=None, retirement=None, batch_races=False,
+                 max_displayed_ships=20, render_fps=30, recorder=None,
+                 islands=1, migration_interval=5, migrant_count=2,
+                 precision='float64', fitness_cache=None, polar=None,
+                 pipeline=False, log=None, archive=None, 
+                 fixed_tracks=False):
         """
         Initalizes Model and View
         Parameters
@@ -31,6 +55,93 @@ class Simulator():
         race_count : int
             number of random races of each generation
             (omitted if random_race=False)
+        headless : boolean
+            if True no GUI is created and tkinter is not imported, the 
+            simulation runs with a null view (for machines without display)
+        workers : int
+            number of worker processes the ships of undisplayed races are
+            sharded across (results do not depend on the number of workers)
+        seed : int
+            seed of all random streams of the simulation, each generation's 
+            races and evolution draw from their own spawned stream thus any
+            generation can be replayed exactly 
+            (if None a random seed is generated)
+        instrumentation : Instrumentation
+            receives the per-phase timers and counters of each generation
+            (see :class:`~instrumentation.Instrumentation`), the records
+            are also kept in instrumentation.records
+        retirement : RetirementPolicy
+            optional pruning policy of the races which retires ships that
+            stopped improving behind the elite and ends the races once the
+            elite of each race finished (requires workers=1, because the 
+            policy compares each ship to the whole population), retiring 
+            is a heuristic: retired ships might still have overtaken the 
+            elite, thus the evolution may differ from the unpruned one
+        batch_races : boolean
+            if True all races of an undisplayed generation are simulated at
+            once as one batch of population_size x race_count ships, the 
+            ranking is the same as of the sequential races
+        max_displayed_ships : int
+            maximum number of ships displayed on the GUI
+        render_fps : int
+            frame rate of the GUI, the simulation runs on a separate thread
+            at full speed while the main thread renders snapshots of the 
+            ships (frames are dropped if the renderer is behind), if None 
+            the races are displayed synchronously tick by tick
+        recorder : TrajectoryRecorder
+            optional recorder of the ship trajectories of the races 
+            simulated in the main process (requires workers=1), see
+            :class:`~trajectory.TrajectoryRecorder`
+        islands : int
+            number of populations evolving in parallel worker processes 
+            (island model, see :class:`~islands.IslandModel`), each island
+            has population_size ships, its races are not displayed 
+            (requires workers=1 and no recorder)
+        migration_interval : int
+            number of generations between two migrations of the islands'
+            elites (omitted if islands=1)
+        migrant_count : int
+            number of ships migrating from each island to the next one
+            (omitted if islands=1)
+        precision : str
+            numerical precision of the simulation: 'float64' or 'float32'
+            (float32 state and preallocated work buffers, faster for large
+            populations, see :class:`~buffered_fleet.BufferedFleet` for 
+            its tolerance)
+        fitness_cache : FitnessCache
+            optional cache of the race results of the genomes, cached 
+            genome/race pairs of undisplayed races are not simulated again
+            (requires no retirement policy, recorder or islands), the
+            results are the same as without the cache, the races are drawn
+            every generation, so only identical genomes of a generation 
+            are simulated once, unless fixed_tracks=True repeats the races
+            (then the unchanged elite is not raced again either)
+        polar : Polar
+            speed model of the ships by their angle to the wind, analytic
+            or tabulated (see :class:`~polar.Polar`), must be picklable for
+            workers and islands (if None the default piecewise linear 
+            polar)
+        pipeline : boolean
+            if True the test race of each undisplayed generation runs on a
+            worker process while the next generation races (pipelined 
+            generations), the test results are the same (omitted with the
+            island model, the tests of recorded races run in the main 
+            process)
+        log : SimulationLog
+            console output of the given verbosity and optional JSON Lines
+            records of the race and generation results (see 
+            :class:`~log.SimulationLog`), if None every message and 
+            progress bar is written
+        archive : GenomeArchive
+            if given the neural networks of outstanding test results are 
+            appended to this archive (see :class:`~archive.GenomeArchive`)
+            instead of separate .npz files in simulation_results/ (the 
+            networks of the islands are saved by the main process too)
+        fixed_tracks : boolean
+            if True the start orientation of each pre-defined track is 
+            drawn once for the whole evolution instead of every generation,
+            thus every generation races on the same 3 races (requires 
+            random_race=False, changes the evolution)
         """
         self.nn_architecture = [2] + nn_architecture + [1]
         self.generation_count = generation_count
@@ -39,36 +150,229 @@ class Simulator():
         self.random_race = random_race
         # there are 3 pre-defined race tracks
         self.race_count = race_count if random_race else 3
+        self.headless = headless
+        self.workers = workers
+        if retirement is not None and workers > 1:
+            raise Exception('Retirement policy requires workers=1')
+        self.retirement = retirement
+        if recorder is not None and workers > 1:
+            raise Exception('Trajectory recording requires workers=1')
+        self.recorder = recorder
+        if islands > 1 and (workers > 1 or recorder is not None):
+            raise Exception('Island model requires workers=1 and no '
+                            'recorder')
+        if islands > 1 and migrant_count > max(self.population_size // 5, 1):
+            raise Exception('Migrant count exceeds the elite count')
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrant_count = migrant_count
+        self.precision = precision
+        self.polar = polar
+        self.pipeline = pipeline
+        if fitness_cache is not None and (retirement is not None or 
+                                          recorder is not None or 
+                                          islands > 1):
+            raise Exception('Fitness cache requires no retirement policy, '
+                            'recorder or islands')
+        self.fitness_cache = fitness_cache
+        if fixed_tracks and random_race:
+            raise Exception('Fixed tracks require random_race=False')
+        self.fixed_tracks = fixed_tracks
+        self.batch_races = batch_races
+        self.render_fps = render_fps
+        self.max_displayed_ships = max_displayed_ships
+        self.seed = np.random.SeedSequence(seed).entropy
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        self.instrumentation = instrumentation
+        if log is None:
+            log = SimulationLog()
+        self.log = log
+        self.archive = archive
+        
+        # index of the next generation to run and test results of each 
+        # generation
+        self.next_generation = 0
+        self.test_results = np.zeros((self.generation_count), dtype ='int32')
+        # process pool of parallel race evaluation and of the pipelined 
+        # test races (created by run)
+        self.evaluator = None
+        self.test_evaluator = None
+        # generation index, genome and future of the submitted test race
+        self.pending_test = None
+        # genomes of each island (island model only)
+        self.island_genomes = None
         
         # init Model and View
-        self.model = Model(self.nn_architecture, self.population_size) 
-        self.view = View()
+        self.model = Model(self.nn_architecture, self.population_size, 
+                           self.generator(INIT_STREAM), precision, polar) 
+        if headless:
+            self.view = view_pack.NullView()
+        else:
+            self.view = view_pack.View(max_displayed_ships)
         
-    def run(self, display=False, disp_from_gen=0):
+    def run(self, display=False, disp_from_gen=0, checkpoint_path=None, 
+            checkpoint_interval=1, plot=True):
         """
         Runs evolution for given numbers of generations and saves the results
         of the current configuration
+        A resumed simulation continues from its next generation
         Parameters
         ----------
         display : boolean
-            display simulation on GUI (if set False the GUI still appears)
+            display simulation on GUI (if set False the GUI still appears,
+            omitted if headless=True)
         disp_from_gen : int
             display simulation on GUI only from given generation 
             (omitted if display=False)
+        checkpoint_path : str
+            path of the checkpoint file of the full simulation state, 
+            rewritten after every checkpoint_interval generations and after
+            the last one (if None no checkpoint is written)
+        checkpoint_interval : int
+            number of generations between two checkpoints
+        plot : boolean
+            if False the test results are not plotted (see 
+            :func:`plot_results`)
         """
-        # test results of each generations
-        self.test_results = np.zeros((self.generation_count), dtype ='int32')
+        self.log.write(GENERATIONS, 'Seed:', self.seed)
+        
+        # process pool for the evaluation of undisplayed races
+        self.evaluator = None
+        if self.workers > 1:
+            self.evaluator = ParallelEvaluator(self.workers, self.precision,
+                                               self.polar)
+        # the test races are queued behind the shards of the races if 
+        # there is a process pool already
+        self.test_evaluator = None
+        if self.pipeline and self.islands == 1:
+            self.test_evaluator = self.evaluator
+            if self.test_evaluator is None:
+                self.test_evaluator = ParallelEvaluator(1, self.precision,
+                                                        self.polar)
         
-        # run the generations
-        for i in range(self.generation_count):
-            if display and i >= disp_from_gen:
-                self.run_generation(i, display=True)
+        try:
+            if self.islands > 1:
+                self.run_islands(checkpoint_path, checkpoint_interval)
+            elif display and not self.headless and self.render_fps:
+                self.run_rendered(display, disp_from_gen, checkpoint_path,
+                                  checkpoint_interval)
             else:
-                self.run_generation(i, display=False)
+                self.run_generations(display, disp_from_gen, 
+                                     checkpoint_path, checkpoint_interval)
+        finally:
+            if self.evaluator is not None:
+                self.evaluator.close()
+            if (self.test_evaluator is not None and 
+                    self.test_evaluator is not self.evaluator):
+                self.test_evaluator.close()
+            self.pending_test = None
             
-        self.plot_results()      
+        if plot:
+            self.plot_results()      
            
-        self.view.root.destroy()
+        self.view.close()
+        
+    def run_generations(self, display, disp_from_gen, checkpoint_path, 
+                        checkpoint_interval):
+        """
+        Runs the generations from the next one and writes the checkpoints
+        (for the parameters see :func:`run`)
+        """
+        for i in range(self.next_generation, self.generation_count):
+            with self.instrumentation.generation(i):
+                if display and i >= disp_from_gen:
+                    self.run_generation(i, display=True)
+                else:
+                    self.run_generation(i, display=False)
+            self.next_generation = i + 1
+            if checkpoint_path is not None and (
+                    self.next_generation % checkpoint_interval == 0 or
+                    self.next_generation == self.generation_count):
+                self.collect_test()
+                self.save_checkpoint(checkpoint_path)
+        self.collect_test()
+                
+    def run_islands(self, checkpoint_path, checkpoint_interval):
+        """
+        Runs the generations from the next one with the island model, the
+        islands are evolved in parallel until the next migration
+        The test result of a generation is the best test result of the
+        islands, the population of the best island is kept in the model
+        (for the parameters see :func:`run`)
+        """
+        from .islands import IslandModel
+        island_model = IslandModel(self, self.islands, 
+                                   self.migration_interval, 
+                                   self.migrant_count)
+        try:
+            if self.island_genomes is not None:
+                island_model.genomes[:] = self.island_genomes
+            while self.next_generation < self.generation_count:
+                start = self.next_generation
+                # the islands migrate after every migration_interval
+                # generations
+                stop = min((start // self.migration_interval + 1) * 
+                           self.migration_interval, self.generation_count)
+                test_results, records, outstanding = island_model.evolve(
+                                                                start, stop)
+                for i, island_records in enumerate(zip(*records)):
+                    self.instrumentation.emit(
+                                GenerationStats.merge(island_records))
+                    self.log.write(GENERATIONS, 
+                                   '{}.generation - test distance of the '
+                                   'islands: {}'.format(start + i, 
+                                                        test_results[:, i]))
+                    self.log.record('generation', generation=start + i,
+                                    test_distance=float(
+                                                test_results[:, i].max()),
+                                    island_test_distances=
+                                            test_results[:, i].tolist())
+                self.test_results[start:stop] = test_results.max(axis=0)
+                # the islands do not save, their outstanding networks are
+                # saved by the main process
+                for generation_index, distance, genome in outstanding:
+                    self.save_outstanding(generation_index, distance, genome)
+                if stop < self.generation_count:
+                    island_model.migrate()
+                self.island_genomes = island_model.genomes.copy()
+                best = int(np.argmax(test_results[:, -1]))
+                self.model.population.genomes = self.island_genomes[best]
+                self.next_generation = stop
+                if checkpoint_path is not None and (
+                        stop // checkpoint_interval > 
+                        start // checkpoint_interval or
+                        stop == self.generation_count):
+                    self.save_checkpoint(checkpoint_path)
+        finally:
+            island_model.close()
+                
+    def run_rendered(self, *args):
+        """
+        Runs the generations on a simulation thread while the GUI renders
+        their snapshots on the main thread (tkinter is not thread safe, 
+        thus only the main thread may touch it)
+        (for the parameters see :func:`run_generations`)
+        """
+        view = self.view
+        self.view = view_pack.RenderQueue(view.max_ships)
+        errors = []
+        def simulate():
+            try:
+                self.run_generations(*args)
+            except BaseException as error:
+                errors.append(error)
+            finally:
+                self.view.close()
+        thread = threading.Thread(target=simulate, daemon=True)
+        thread.start()
+        try:
+            view.render(self.view, self.render_fps)
+        finally:
+            thread.join()
+            self.view = view
+        if errors:
+            raise errors[0]
   
     def run_generation(self, generation_index, display=False):
         """
@@ -79,66 +383,229 @@ class Simulator():
         generation and saves it's result (the best NN will be the first one in
         the next generation after mutation b/c of elitism)
         """
-        print('------------------------------------------')
-        print(generation_index, '.generation')
+        self.log.generation_start(generation_index)
+        phase = self.instrumentation.phase
         
         # normal generation simulation in a standard or random environment        
-        for race_number in range(1, self.race_count + 1):
-            print('- {}. race'.format(race_number))
-            self.model.prepare_generation(self.random_race, race_number)
-            self.view.prepare_generation(self.model, display, generation_index,
-                                         race_number)
-            self.run_simulation()
-            print('')
-            self.view.clear()
-            self.evaluate()
+        if self.batch_races and not display:
+            race_results = self.run_races(generation_index)
+        else:
+            # generator, thus each race is evaluated before the next one runs
+            race_results = (self.run_race(generation_index, race_number, 
+                                          display)
+                            for race_number in range(1, self.race_count + 1))
+        
+        for race_number, (results, buoys, counters) in enumerate(
+                                                            race_results, 1):
+            self.instrumentation.count_race(results, len(buoys), MAX_TICKS,
+                                            **counters)
+            with phase('evaluate'):
+                order = self.evaluate(results)
+            self.log.race_results(generation_index, race_number, results, 
+                                  order, len(buoys))
             
-        self.evolve(generation_index)
+        with phase('evolve'):
+            self.evolve(generation_index)
         
-        # test run of current generation's best ship
-        print('\nTest of', generation_index, '.generation')
+        with phase('test'):
+            if (self.test_evaluator is not None and not display and 
+                    self.recorder is None):
+                self.submit_test(generation_index)
+            else:
+                self.run_test(generation_index, display)
+        
+    def run_race(self, generation_index, race_number, display=False):
+        """
+        Runs a single race of the generation
+        Returns
+        tuple
+            results of the race (curr_buoy_index, min_distance and time 
+            arrays), its buoys and its instrumentation counters
+        """
+        phase = self.instrumentation.phase
+        # displayed races simulate every ship
+        cache = None if display else self.fitness_cache
+        with phase('prepare'):
+            self.model.prepare_generation(self.random_race, race_number, 
+                                          self.race_generator(
+                                                generation_index, 
+                                                race_number),
+                                          self.retirement, cache)
+        self.log.race_start(race_number, 
+                            len(self.model.buoys) if self.random_race 
+                            else None)
+        cached = self.model.population.cached_count
+        if self.evaluator is not None and not display:
+            # the view is not needed, ships are simulated in parallel
+            with phase('simulate'):
+                results = self.model.run_race(self.evaluator)
+            return results, self.model.buoys, {'cached': cached}
+        with phase('prepare'):
+            self.view.prepare_generation(self.model, display, 
+                                         generation_index, race_number)
+        recording = self.start_recording(generation_index, [race_number])
+        with phase('simulate'):
+            self.run_simulation(recording=recording)
+            self.log.end_progress()
+            self.view.clear()
+        counters = self.model.population.fleet.race_counters(0)
+        counters['cached'] = cached
+        return self.model.race_results()[0], self.model.buoys, counters
+        
+    def run_races(self, generation_index):
+        """
+        Runs all races of the generation at once as one batch of 
+        population_size x race_count ships (without display)
+        Returns
+        list of tuples
+            results of each race (curr_buoy_index, min_distance and time 
+            arrays), its buoys and its instrumentation counters
+        """
+        phase = self.instrumentation.phase
+        race_numbers = range(1, self.race_count + 1)
+        with phase('prepare'):
+            self.model.prepare_races(self.random_race, race_numbers, 
+                                     [self.race_generator(generation_index,
+                                                          race_number)
+                                      for race_number in race_numbers],
+                                     self.retirement, self.fitness_cache)
+        buoys = [buoys for buoys, _, _ in self.model.races]
+        self.log.races_start(self.race_count, 
+                             [len(b) for b in buoys] if self.random_race 
+                             else ())
+        cached = self.model.population.cached_count
+        if self.evaluator is not None:
+            with phase('simulate'):
+                race_results = self.model.run_races(self.evaluator)
+            return [(results, b, {'cached': cached}) 
+                    for results, b in zip(race_results, buoys)]
+        recording = self.start_recording(generation_index, race_numbers)
+        with phase('simulate'):
+            self.run_simulation(recording=recording)
+            self.log.end_progress()
+        fleet = self.model.population.fleet
+        return [(results, b, dict(fleet.race_counters(race), cached=cached)) 
+                for race, (results, b) in enumerate(zip(
+                                        self.model.race_results(), buoys))]
+        
+    def run_test(self, generation_index, display=False):
+        """
+        Runs the test race of the current generation's best ship and saves
+        its result
+        """
+        self.log.test_start(generation_index)
         self.model.prepare_test()            
         self.view.prepare_generation(self.model, display, 
                                      generation_index, test=True)
-        self.run_simulation(test=True)        
+        recording = self.start_recording(generation_index, test=True)
+        self.run_simulation(test=True, recording=recording)
         
         # calculate test results
-        ship = self.model.population.ship_population[0]  
-        if ship.curr_buoy_index == 4:
-            distance = 2200
-        else:
-            distance = 550 * (ship.curr_buoy_index + 1) - ship.min_distance
-        print('Distance sailed on test track:\n{}'.format(int(distance)))
+        ship = self.model.population[0]  
+        distance = self.model.test_distance(ship.curr_buoy_index, 
+                                            ship.min_distance).item()
+        self.save_test_result(generation_index, distance)
+        self.view.clear()  
+        
+    def submit_test(self, generation_index):
+        """
+        Submits the test race of the current generation's best ship to a 
+        worker process, it runs while the next generation races and its 
+        result is saved by :func:`collect_test` (at most one test race is
+        pending, the former one is collected first)
+        """
+        self.collect_test()
+        self.log.test_start(generation_index, submitted=True)
+        population = self.model.population
+        # the genome is copied, the next generation's evolution replaces 
+        # the population
+        genome = population.genomes[0].copy()
+        future = self.test_evaluator.submit_races(
+                                    population.batch_network(genome[None]),
+                                    [self.model.make_test_race()], MAX_TICKS)
+        self.pending_test = (generation_index, genome, future)
+        
+    def collect_test(self):
+        """
+        Waits for the pending test race (if any) and saves its result
+        """
+        if self.pending_test is None:
+            return
+        generation_index, genome, future = self.pending_test
+        self.pending_test = None
+        curr_buoy_index, min_distance, _ = future.result()[0]
+        self.log.test_start(generation_index)
+        distance = self.model.test_distance(curr_buoy_index[0], 
+                                            min_distance[0]).item()
+        self.save_test_result(generation_index, distance, genome)
+        
+    def save_test_result(self, generation_index, distance, genome=None):
+        """
+        Saves the test distance of the generation's best ship (the given 
+        genome or the first one of the population)
+        """
+        self.log.test_result(generation_index, distance)
         # save best ship's test distance into test_results
         self.test_results[generation_index] = distance
         # if the test result is outstanding that neural network will be saved
         if distance > 1800:
-            print('DISTANCE OVER 1800')
-            self.model.save(generation_index, distance)
-        self.view.clear()  
+            self.save_outstanding(generation_index, distance, genome)
+            
+    def save_outstanding(self, generation_index, distance, genome=None):
+        """
+        Saves the neural network of an outstanding test result (the given
+        genome or the first one of the population) into the archive if any,
+        otherwise into an .npz file
+        """
+        if self.archive is None:
+            self.model.save(generation_index, distance, genome)
+        else:
+            if genome is None:
+                genome = self.model.population.genomes[0]
+            self.archive.append(genome, self.nn_architecture, 
+                                generation_index, distance, self.seed)
         
-    def run_simulation(self, test=False):
+    def run_simulation(self, test=False, recording=None):
         """
         Runs simulation by calls model.update() and view.update() methods
-        for 1000 time units at most
+        for MAX_TICKS time units at most
+        The optional recording (RaceRecording) records every time unit
         """
-        lb = LoadingBar(1000, 'Simulation')
-        for t in range(1000):
+        lb = None if test else self.log.progress_bar(MAX_TICKS, 
+                                                     'Simulation')
+        for t in range(MAX_TICKS):
             self.model.update(t)
             self.view.update(self.model, t)
+            if recording is not None:
+                recording.record(self.model.population.fleet, t)
             # stop simulation if all ships reached all the targets
             if self.model.population.finished:                
-                return            
-            if not test:
+                break            
+            if lb is not None:
                 lb()             
+        if recording is not None:
+            recording.close()
+            
+    def start_recording(self, generation_index, race_numbers=(0,), 
+                        test=False):
+        """
+        Starts the recording of the prepared races if there is a recorder
+        Returns
+        RaceRecording
+            None if the races are not recorded
+        """
+        if self.recorder is None:
+            return None
+        return self.recorder.start(self.model, generation_index, 
+                                   race_numbers, test)
         
-    def evaluate(self):
+    def evaluate(self, results=None):
         """
         Orders the list of ships by fitness and updates each ship's rank 
-        accordingly 
+        accordingly, returns the order
         (for details see :func:`~population.Population.evaluate`)
         """
-        self.model.evaluate()
+        return self.model.evaluate(results)
         
     def evolve(self, generation_index):
         """
@@ -148,12 +615,34 @@ class Simulator():
         """
         mr = self.mutation_rate * (1 - 0.1 * (generation_index / 
                                               self.generation_count))
-        self.model.evolve(mr) 
+        self.model.evolve(mr, self.generator(EVOLVE_STREAM, 
+                                             generation_index)) 
+        
+    def race_generator(self, generation_index, race_number):
+        """
+        Returns the random number generator of a race of the generation
+        With fixed tracks every generation races on the same races (the
+        stream only depends on the race number)
+        """
+        if self.fixed_tracks:
+            return self.generator(TRACK_STREAM, race_number)
+        return self.generator(RACE_STREAM, generation_index, race_number)
+        
+    def generator(self, *key):
+        """
+        Returns the random number generator of the stream identified by key
+        The stream only depends on the simulation seed and the key, 
+        independently of any other stream or the order of execution
+        """
+        seed_sequence = np.random.SeedSequence(self.seed, spawn_key=key)
+        return np.random.default_rng(seed_sequence)
         
     def plot_results(self):
         """
         Plots simulation results saved in self.test_results
         """
+        # matplotlib is only imported when plotting
+        import matplotlib.pyplot as plt
         # plt.figure(dpi=300) # for high resolution graphs
         plt.title('Best ship travel distance of each generation')
         plt.xlabel('Generation')
@@ -175,38 +664,163 @@ class Simulator():
                     str(self.mutation_rate))        
         plt.savefig(filename, dpi=300)
         
-        plt.show() 
+        if not self.headless:
+            plt.show() 
+        
+    def save_checkpoint(self, path):
+        """
+        Saves the full simulation state into an uncompressed .npz file
+        The file contains only plain arrays (no pickled objects) and it is 
+        written atomically: a temporary file is replaced, thus an 
+        interrupted write never corrupts the former checkpoint
+        The random streams are fully determined by the seed and the 
+        generation index, so these restore the RNG state as well as the 
+        position in the mutation rate schedule
+        """
+        population = self.model.population
+        # settings changing the results, the other objects (e.g. the polar)
+        # must be given to resume again
+        settings = {'retirement_patience': -1 if self.retirement is None
+                                           else self.retirement.patience,
+                    'fitness_cache_capacity': 
+                                    0 if self.fitness_cache is None
+                                    else self.fitness_cache.capacity,
+                    'batch_races': self.batch_races,
+                    'fixed_tracks': self.fixed_tracks,
+                    'pipeline': self.pipeline,
+                    'max_displayed_ships': self.max_displayed_ships}
+        islands = {}
+        if self.islands > 1:
+            islands = {'islands': self.islands,
+                       'migration_interval': self.migration_interval,
+                       'migrant_count': self.migrant_count,
+                       'island_genomes': self.island_genomes}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, 
+                     **islands,
+                     **settings,
+                     version=CHECKPOINT_VERSION,
+                     nn_architecture=np.array(self.nn_architecture),
+                     generation_count=self.generation_count,
+                     population_size=self.population_size,
+                     mutation_rate=self.mutation_rate,
+                     random_race=self.random_race,
+                     race_count=self.race_count,
+                     precision=self.precision,
+                     seed=str(self.seed),
+                     next_generation=self.next_generation,
+                     genomes=population.genomes,
+                     ranks=population.ranks,
+                     test_results=self.test_results)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        
+    @classmethod
+    def resume(cls, path, display=False, disp_from_gen=0, 
+               checkpoint_interval=1, headless=False, workers=1, 
+               polar=None, log=None, plot=True, **kwargs):
+        """
+        Restores a simulation from a checkpoint file written by 
+        :func:`save_checkpoint` and continues its evolution from the next 
+        generation, checkpoints are written into the same file
+        The retirement policy, the fitness cache (empty) and the scalar 
+        settings are restored from the checkpoint, the other objects (e.g.
+        the polar, the recorder or the archive) are not stored, the resumed
+        simulation must be given the same ones as keyword arguments of 
+        :func:`__init__` (which also override the restored settings)
+        (for the other parameters see :func:`__init__` and :func:`run`)
+        Returns
+        Simulator
+            the resumed simulator
+        """
+        with np.load(path) as file:
+            if int(file['version']) != CHECKPOINT_VERSION:
+                raise Exception('Unsupported checkpoint version')
+            settings = {}
+            patience = int(file.get('retirement_patience', -1))
+            if patience >= 0:
+                settings['retirement'] = RetirementPolicy(patience)
+            capacity = int(file.get('fitness_cache_capacity', 0))
+            if capacity > 0:
+                settings['fitness_cache'] = FitnessCache(capacity)
+            for name in ('batch_races', 'pipeline', 'fixed_tracks'):
+                if name in file:
+                    settings[name] = bool(file[name])
+            if 'max_displayed_ships' in file:
+                settings['max_displayed_ships'] = int(
+                                                file['max_displayed_ships'])
+            settings.update(kwargs)
+            sim = cls(nn_architecture=file['nn_architecture'][1:-1].tolist(),
+                      generation_count=int(file['generation_count']),
+                      population_size=int(file['population_size']),
+                      mutation_rate=file['mutation_rate'].item(),
+                      random_race=bool(file['random_race']),
+                      race_count=int(file['race_count']),
+                      headless=headless,
+                      workers=workers,
+                      seed=int(str(file['seed'])),
+                      islands=int(file.get('islands', 1)),
+                      migration_interval=int(file.get('migration_interval',
+                                                      5)),
+                      migrant_count=int(file.get('migrant_count', 2)),
+                      precision=str(file.get('precision', 'float64')),
+                      polar=polar,
+                      log=log,
+                      **settings)
+            if 'island_genomes' in file:
+                sim.island_genomes = file['island_genomes']
+            sim.next_generation = int(file['next_generation'])
+            sim.test_results[:] = file['test_results']
+            population = sim.model.population
+            population.genomes = file['genomes']
+            population.ranks = file['ranks']
+        sim.log.write(GENERATIONS, 'Resuming from', sim.next_generation, 
+                      '.generation')
+        sim.run(display, disp_from_gen, checkpoint_path=path, 
+                checkpoint_interval=checkpoint_interval, plot=plot)
+        return sim
         
     @classmethod
-    def load_and_test(cls, filename):
+    def load_and_test(cls, filename, log=None):
         """
         Loads and runs a test with the given neural network
         NN must be in a compressed .npz file
         Parameters
         filename : str
             path of .npz file
+        log : SimulationLog
+            console output of the test (if None every message is written)
         """
+        if log is None:
+            log = SimulationLog()
         # init Model and View
         model = Model([], 1) 
-        view = View()
+        view = view_pack.View()
           
         # inject loaded ship
         model.load(filename) 
         
         # test run of current generation's best ship
-        print('\nTest of', filename)
+        log.write(GENERATIONS, '\nTest of', filename)
         model.prepare_test()            
         view.prepare_generation(model, display=True, generation_index=-1, 
                                 test=True)
         
         # run test simulation
-        for t in range(1000):
+        for t in range(MAX_TICKS):
             model.update(t)
             view.update(model, t)
             # stop simulation if ship reached all the targets
             if model.population.finished:                
                 break            
+        ship = model.population[0]
+        distance = model.test_distance(ship.curr_buoy_index, 
+                                       ship.min_distance).item()
+        log.write(GENERATIONS, 'Distance sailed on test track:\n{}'.format(
+                                                                int(distance)))
         
-        view.root.destroy()
+        view.close()
      
         
@@ -0,0 +1,208 @@
+"""
+Hyperparameter sweep of the simulation
+
+Runs independent headless Simulator configurations concurrently on a
+process pool and aggregates their test results and timing into one table,
+e.g.::
+
+    python -m sail.sweep sweep.json --workers 8 --output sweep.csv
+
+The search is specified by a JSON file::
+
+    {"mode": "grid",
+     "space": {"nn_architecture": [[5], [16, 16]],
+               "population_size": [100, 200],
+               "mutation_rate": [20, 30]},
+     "fixed": {"generation_count": 30, "race_count": 2},
+     "seeds": [0, 1]}
+
+In "random" mode "samples" configurations are drawn from the space, each
+parameter is chosen from its list of values or drawn uniformly from a
+{"low": ..., "high": ...} range (integers if both bounds are integers)
+"""
+import argparse
+import csv
+import itertools
+import json
+import time
+import numpy as np
+from .log import QUIET, SimulationLog
+from .simulator import Simulator
+
+# parameters of the swept Simulator if not specified
+DEFAULTS = {'nn_architecture': [5],
+            'generation_count': 20,
+            'population_size': 100,
+            'mutation_rate': 30,
+            'random_race': True,
+            'race_count': 1}
+
+
+def grid_configs(space, fixed=None):
+    """
+    Returns every combination of the values of the space
+    Parameters
+    space : dict
+        list of values of each swept parameter
+    fixed : dict
+        values of the parameters which are not swept
+    """
+    names = list(space)
+    configs = []
+    for values in itertools.product(*(space[name] for name in names)):
+        config = dict(DEFAULTS, **(fixed or {}))
+        config.update(zip(names, values))
+        configs.append(config)
+    return configs
+
+
+def random_configs(space, samples, rng, fixed=None):
+    """
+    Returns samples randomly drawn configurations of the space
+    Parameters
+    space : dict
+        list of values or {'low': ..., 'high': ...} range of each swept
+        parameter
+    rng : numpy.random.Generator
+        random number generator of the drawing
+    fixed : dict
+        values of the parameters which are not swept
+    """
+    configs = []
+    for _ in range(samples):
+        config = dict(DEFAULTS, **(fixed or {}))
+        for name, values in space.items():
+            if isinstance(values, dict):
+                low, high = values['low'], values['high']
+                if isinstance(low, int) and isinstance(high, int):
+                    config[name] = int(rng.integers(low, high + 1))
+                else:
+                    config[name] = float(rng.uniform(low, high))
+            else:
+                config[name] = values[rng.integers(len(values))]
+        configs.append(config)
+    return configs
+
+
+def run_config(config, seed):
+    """
+    Runs the evolution of a single configuration headless (runs in worker
+    processes)
+    Returns
+    dict
+        the configuration as simulated (the Simulator rounds the population
+        size down to a multiple of 10 and races on the 3 standard tracks if
+        random_race is False), the requested configuration, its seed, test
+        results and timing
+    """
+    start = time.perf_counter()
+    # the configurations run simultaneously, their output is not written
+    sim = Simulator(headless=True, seed=seed, log=SimulationLog(QUIET), 
+                    **config)
+    sim.run(plot=False)
+    total_time = time.perf_counter() - start
+    test_results = sim.test_results.tolist()
+    return {'config': dict(config, population_size=sim.population_size,
+                           race_count=sim.race_count),
+            'requested_config': config,
+            'seed': seed,
+            'best_distance': max(test_results),
+            'final_distance': test_results[-1],
+            'time_total': total_time,
+            'time_per_generation': total_time / len(test_results),
+            'test_results': test_results}
+
+
+def run_sweep(configs, seeds=(0,), workers=1):
+    """
+    Runs every configuration with every seed on a pool of worker processes
+    Returns
+    list of dictionaries
+        one record per run (see :func:`run_config`) in the order of the
+        configurations and seeds
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    runs = list(itertools.product(configs, seeds))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_config, config, seed)
+                   for config, seed in runs]
+        records = []
+        for i, future in enumerate(futures):
+            record = future.result()
+            records.append(record)
+            print('{}/{} {:>6d} {:>6d} {:>8.1f}s {}'.format(
+                i + 1, len(runs), record['best_distance'],
+                record['final_distance'], record['time_total'],
+                json.dumps(record['config'])))
+    return records
+
+
+def write_table(records, path):
+    """
+    Writes the records into a CSV file, one row per run with the swept
+    parameters, the timing and the test result of each generation
+    """
+    generation_count = max(len(record['test_results'])
+                           for record in records)
+    names = list(records[0]['config'])
+    summary = ['seed', 'best_distance', 'final_distance', 'time_total',
+               'time_per_generation']
+    fieldnames = (names + summary +
+                  ['test_{}'.format(i) for i in range(generation_count)])
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        for record in records:
+            row = {name: json.dumps(value)
+                   if isinstance(value, list) else value
+                   for name, value in record['config'].items()}
+            for name in summary:
+                row[name] = record[name]
+            for i, distance in enumerate(record['test_results']):
+                row['test_{}'.format(i)] = distance
+            writer.writerow(row)
+
+
+def load_spec(path):
+    """
+    Reads the sweep specification of a JSON file
+    Returns
+    tuple
+        list of configurations and list of seeds
+    """
+    with open(path) as file:
+        spec = json.load(file)
+    mode = spec.get('mode', 'grid')
+    if mode == 'grid':
+        configs = grid_configs(spec['space'], spec.get('fixed'))
+    elif mode == 'random':
+        rng = np.random.default_rng(spec.get('sampling_seed'))
+        configs = random_configs(spec['space'], spec['samples'], rng,
+                                 spec.get('fixed'))
+    else:
+        raise Exception('Invalid sweep mode')
+    return configs, spec.get('seeds', [0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sail.sweep',
+        description='Runs a hyperparameter sweep of headless simulations')
+    parser.add_argument('spec', help='path of the JSON sweep specification')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes')
+    parser.add_argument('--output', help='path of the CSV results table')
+    parser.add_argument('--json', help='path of the JSON results file')
+    args = parser.parse_args(argv)
+
+    configs, seeds = load_spec(args.spec)
+    records = run_sweep(configs, seeds, args.workers)
+    if args.output is not None:
+        write_table(records, args.output)
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump(records, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Recording and replay of the ship trajectories
+
+The trajectories of a race are written into a preallocated, memory-mapped
+.npy file of float32 (ticks x ships x fields) frames, fields being x, y,
+orientation and speed, the track and wind of the race are stored in a
+.json file next to it
+
+Recorded races are replayed on the GUI without running the model, e.g.::
+
+    python -m sail.trajectory recordings/gen0009_test.npy
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from .model_pack import Buoys, Wind
+
+# version of the recording file format
+RECORDING_VERSION = 1
+
+# recorded state of each ship in a frame
+FIELDS = ('x', 'y', 'orientation', 'speed')
+
+
+class TrajectoryRecorder:
+    """
+    Records the trajectories of the races simulated by the Simulator
+    Each race is written into its own memory-mapped file, so the memory
+    used does not depend on the number of recorded ticks and races
+    """
+    def __init__(self, directory, generations=None, ship_count=None,
+                 max_ticks=1000):
+        """
+        Parameters
+        directory : str
+            directory of the recording files (created if not exists)
+        generations : iterable of integers
+            indices of the recorded generations (if None all generations
+            are recorded)
+        ship_count : int
+            number of recorded ships of each race, the first ones of the
+            population, i.e. the elite of the former generation (if None
+            all ships are recorded)
+        max_ticks : int
+            maximum number of time units of a race
+        """
+        self.directory = directory
+        self.generations = None if generations is None else set(generations)
+        self.ship_count = ship_count
+        self.max_ticks = max_ticks
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self, model, generation_index, race_numbers=(0,), test=False):
+        """
+        Creates the recording files of the prepared races of the model
+        Parameters
+        race_numbers : iterable of integers
+            number of each race of model.races
+        Returns
+        RaceRecording
+            the recording of the races (None if the generation is not
+            recorded)
+        """
+        if (self.generations is not None and
+                generation_index not in self.generations):
+            return None
+        fleet = model.population.fleet
+        ship_count = fleet.population_size
+        if self.ship_count is not None:
+            ship_count = min(ship_count, self.ship_count)
+        races = []
+        for race, (race_number, (buoys, wind, start_position)) in enumerate(
+                                            zip(race_numbers, model.races)):
+            if test:
+                name = 'gen{:04d}_test'.format(generation_index)
+            else:
+                name = 'gen{:04d}_race{}'.format(generation_index,
+                                                 race_number)
+            path = os.path.join(self.directory, name)
+            frames = np.lib.format.open_memmap(
+                            path + '.npy', mode='w+', dtype='float32',
+                            shape=(self.max_ticks, ship_count, len(FIELDS)))
+            metadata = {'version': RECORDING_VERSION,
+                        'generation': generation_index,
+                        'race': race_number,
+                        'test': test,
+                        'fields': list(FIELDS),
+                        'ship_count': ship_count,
+                        'ticks': 0,
+                        'buoys': [[float(buoy.x), float(buoy.y)]
+                                  for buoy in buoys],
+                        'wind_orientation': float(wind.orientation),
+                        'start_position': {key: float(value) for key, value
+                                           in start_position.items()}}
+            races.append((fleet.race_lanes(race), frames, metadata, path))
+        return RaceRecording(races, ship_count)
+
+
+class RaceRecording:
+    """
+    Recording of the races of a fleet in progress
+    """
+    def __init__(self, races, ship_count):
+        """
+        Parameters
+        races : list of tuples
+            lane slice, memory-mapped frames, metadata and path (without
+            extension) of each race
+        ship_count : int
+            number of recorded ships of each race
+        """
+        self.races = races
+        self.ship_count = ship_count
+        self.ticks = 0
+
+    def record(self, fleet, time_):
+        """
+        Writes the state of the recorded ships at the given time unit
+        """
+        for lanes, frames, _, _ in self.races:
+            recorded = slice(lanes.start, lanes.start + self.ship_count)
+            frame = frames[time_]
+            frame[:, 0] = fleet.x[recorded]
+            frame[:, 1] = fleet.y[recorded]
+            frame[:, 2] = fleet.orientation[recorded]
+            frame[:, 3] = fleet.speed[recorded]
+        self.ticks = time_ + 1
+
+    def close(self):
+        """
+        Flushes the frames and writes the metadata of the races
+        """
+        for _, frames, metadata, path in self.races:
+            frames.flush()
+            metadata['ticks'] = self.ticks
+            with open(path + '.json', 'w') as file:
+                json.dump(metadata, file, indent=2)
+        self.races = []
+
+
+def load_trajectory(path):
+    """
+    Opens a recorded race read-only without loading its frames into memory
+    Parameters
+    path : str
+        path of the .npy frames file (or of the metadata .json file)
+    Returns
+    tuple
+        memory-mapped frames of the recorded ticks (ticks x ships x fields)
+        and the metadata dictionary
+    """
+    base = os.path.splitext(path)[0]
+    with open(base + '.json') as file:
+        metadata = json.load(file)
+    if metadata['version'] != RECORDING_VERSION:
+        raise Exception('Unsupported recording version')
+    frames = np.load(base + '.npy', mmap_mode='r')
+    return frames[:metadata['ticks']], metadata
+
+
+def replay(path, view=None, fps=50, max_ships=20):
+    """
+    Displays a recorded race on the GUI without running the model
+    Parameters
+    path : str
+        path of the recorded race (see :func:`load_trajectory`)
+    view : View
+        view displaying the race (if None a new window is opened)
+    fps : int
+        number of displayed time units per second
+    max_ships : int
+        maximum number of displayed ships
+    """
+    from .view_pack import View
+    from .view_pack.misc import race_label
+    frames, metadata = load_trajectory(path)
+    if view is None:
+        view = View(max_ships)
+    ship_count = min(frames.shape[1], view.max_ships)
+    view.prepare_race(race_label(metadata['generation'], metadata['race'],
+                                 metadata['test']),
+                      True, Wind(random=False,
+                                 orientation=metadata['wind_orientation']),
+                      Buoys.from_coords(metadata['buoys']), ship_count)
+    for t, frame in enumerate(frames):
+        # the Next Generation button skips the rest of the race
+        if not view.display:
+            break
+        view.draw_frame(t, frame[:ship_count, 0], frame[:ship_count, 1],
+                        frame[:ship_count, 2])
+        view.root.update()
+        time.sleep(1 / fps)
+    view.clear()
+    return view
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sail.trajectory',
+        description='Replays recorded races on the GUI')
+    parser.add_argument('paths', nargs='+',
+                        help='recorded races (.npy files)')
+    parser.add_argument('--fps', type=int, default=50,
+                        help='displayed time units per second')
+    parser.add_argument('--max-ships', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    view = None
+    for path in args.paths:
+        view = replay(path, view, args.fps, args.max_ships)
+    view.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,18 @@
+import importlib
 from .ship_view import ShipView
 from .buoy_view import BuoyView
-from .wind_view import WindView
 from .misc import LoadingBar
+from .null_view import NullView
+from .render_queue import RenderQueue
 
-from .view import *
\ No newline at end of file
+# views depending on tkinter are imported on first access only, thus
+# headless simulations never import tkinter
+_tk_views = {'View': '.view', 'WindView': '.wind_view'}
+
+
+def __getattr__(name):
+    if name in _tk_views:
+        return getattr(importlib.import_module(_tk_views[name], __name__), 
+                       name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__,
+                                                                    name))
@@ -10,13 +10,13 @@ class BuoyView:
                                             buoy.y - (self.size/2),
                                             buoy.x + (self.size/2),
                                             buoy.y + (self.size/2), 
-                                            fill='yellow')
+                                            fill='yellow', tags='buoy')
         
         self.index = index + 1
         self.index_view = canvas.create_text(buoy.x - 12, buoy.y - 12,
                                              text=self.index, 
                                              font='Helvetica 16 bold',
-                                             fill='yellow')    
+                                             fill='yellow', tags='buoy')    
         
     def clear(self, canvas):
         canvas.delete(self.buoy_view) 
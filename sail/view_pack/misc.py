@@ -1,26 +1,52 @@
 import sys
+import time
 
 
 class LoadingBar:
     
-    def __init__(self, size, message):
+    def __init__(self, size, message, interval=None, stream=None):
+        """
+        Progress bar of size steps, redrawn at every percent but at most 
+        once in every interval seconds (if given) to limit the console 
+        output, the stream is the current sys.stdout if None
+        """
         self.size = size
         self.message = message
         self.bar_length = 30
         self.index = 0
+        self.interval = interval
+        self.stream = stream
+        self.last_time = None
         
     def __call__(self):
         self.index += 1 
         if self.index % (self.size / 100) != 0:
             return
         i = self.index
+        if self.interval is not None and i != self.size:
+            now = time.monotonic()
+            if (self.last_time is not None and 
+                    now - self.last_time < self.interval):
+                return
+            self.last_time = now
+        stream = sys.stdout if self.stream is None else self.stream
         line = (str(int(i * 100 / self.size)) + '%' + ' ' + self.message +
                 ' |' + '|' * int(self.bar_length * i / self.size) + 
                 '.' * int(self.bar_length * (1 - (i / self.size))) + 
                 '|   ')                
-        sys.stdout.write('\r' + line)
+        stream.write('\r' + line)
         if i == self.size:
             # delete loading bar
-            sys.stdout.write('\r' + (50 * ' '))
-            sys.stdout.write('\r')
+            stream.write('\r' + (50 * ' '))
+            stream.write('\r')
 
+
+
+def race_label(generation_index, race_number=0, test=False):
+    """
+    Returns the title of a race displayed above the canvas
+    """
+    if test:
+        return 'Test of ' + str(generation_index + 1) + '. generation'
+    return (str(generation_index + 1) + '. generation - ' + 
+            str(race_number) + '. race')
@@ -0,0 +1,27 @@
+class NullView:
+    """
+    View without any display functionality for headless simulations
+    Provides the interface of :class:`~view.View` without importing tkinter
+    or creating any canvas objects
+    """
+    def __init__(self):
+        self.display = False
+
+    def prepare_generation(self, model, display, generation_index,
+                           race_number=0, test=False):
+        pass
+
+    def stop_update(self):
+        pass
+
+    def update(self, model, time_):
+        pass
+
+    def clear(self):
+        pass
+
+    def mainloop(self):
+        pass
+
+    def close(self):
+        pass
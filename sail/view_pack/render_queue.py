@@ -0,0 +1,105 @@
+import queue
+from .misc import race_label
+
+
+class RenderQueue:
+    """
+    View of the simulation thread passing snapshots of the races to a View
+    which renders them on the main thread at its own frame rate 
+    (see :func:`~view.View.render`)
+    Provides the interface of :class:`~view.View` without touching tkinter
+    The queue is bounded: frames are dropped while the renderer is behind,
+    so the simulation is never slowed down by the display, but control
+    messages (prepare, clear and close) of the displayed races are never 
+    dropped
+    Undisplayed races send no message, only their title is passed to the
+    renderer without waiting (see :attr:`title`)
+    """
+    def __init__(self, max_ships=20, max_frames=2):
+        """
+        Parameters
+        max_ships : int
+            maximum number of ships in a snapshot
+        max_frames : int
+            maximum number of pending messages
+        """
+        self.display = False
+        self.max_ships = max_ships
+        self.ship_count = 0
+        self.messages = queue.Queue(maxsize=max_frames)
+        # set by the renderer when it stopped consuming the messages
+        self.closed = False
+        self.dropped_frames = 0
+        # number of the control messages sent
+        self.sent = 0
+        # True while the prepared race is displayed (must be cleared)
+        self.prepared = False
+        # number of the control messages sent before and title of the 
+        # latest undisplayed race (None if there was no undisplayed race)
+        self.title = None
+
+    def send(self, message):
+        """
+        Puts a control message into the queue, waits for free space unless
+        the renderer is closed
+        """
+        while not self.closed:
+            try:
+                self.messages.put(message, timeout=0.1)
+                self.sent += 1
+                return
+            except queue.Full:
+                pass
+
+    def prepare_generation(self, model, display, generation_index,
+                           race_number=0, test=False):
+        """
+        Sends the race to the renderer if displayed, otherwise only updates
+        the title without waiting for the renderer
+        """
+        self.display = display
+        label = race_label(generation_index, race_number, test)
+        if not display:
+            self.title = (self.sent, label)
+            return
+        self.ship_count = min(len(model.population), self.max_ships)
+        self.prepared = True
+        self.send(('prepare', label, display, model.wind, model.buoys, 
+                   self.ship_count))
+
+    def stop_update(self):
+        """
+        Stops sending the frames of the current race (called by the 
+        renderer's Next Generation button)
+        """
+        self.display = False
+
+    def update(self, model, time_):
+        """
+        Puts a snapshot of the displayed ships into the queue if there is
+        free space, otherwise the frame is dropped
+        """
+        if not self.display or self.closed:
+            return
+        fleet = model.population.fleet
+        n = self.ship_count
+        frame = ('frame', time_, fleet.x[:n].copy(), fleet.y[:n].copy(),
+                 fleet.orientation[:n].copy())
+        try:
+            self.messages.put_nowait(frame)
+        except queue.Full:
+            self.dropped_frames += 1
+
+    def clear(self):
+        """
+        Clears the displayed race (undisplayed races have nothing to clear)
+        """
+        if self.prepared:
+            self.prepared = False
+            self.send(('clear',))
+
+    def mainloop(self):
+        pass
+
+    def close(self):
+        self.send(('close',))
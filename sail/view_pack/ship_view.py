@@ -4,54 +4,66 @@ import cmath
 class ShipView:
     """
     Displays ship model
+    The canvas items are created once and moved on every update
     """ 
     def __init__(self):
         SIZE = 2 # common size factor of ship elements
         # hull polygon coordinates (ship center is in origo)
         hull = [[-7,-4],[3,-4],[8,0],[3,4],[-7,4]]
         # rescale by SIZE
-        self.hull = [[SIZE * j for j in i] for i in hull]
+        self.hull = [complex(SIZE * x, SIZE * y) for x, y in hull]
         self.hull_view = None
         # sail polygon coordinates (ship center is in origo)
         sail = [[-0.5,-3],[-1.5,-6],[-1.4,-6.1],[0.5,-3],[0.5,3],[-1.4,6.1],
                 [-1.5,6],[-0.5,3]]
         # rescale by SIZE
-        self.sail = [[SIZE * j for j in i] for i in sail]
+        self.sail = [complex(SIZE * x, SIZE * y) for x, y in sail]
         self.sail_view = None
+        self.visible = False
         
     def update(self, canvas, ship):   
+        self.draw(canvas, ship.x, ship.y, ship.orientation)
+        
+    def draw(self, canvas, x, y, orientation):
         """
         Rotates hull and sail coordinates with ship orientation,
         Offsets hull and sail coordinates with ship center coordinates,
-        Updates canvas with new coordinates
+        Moves the canvas items to the new coordinates
         """
-        ccenter = complex(ship.x, ship.y)        
-        cangle = cmath.exp(ship.orientation * 1j)
-        hull = []
-        for x, y in self.hull:
-            cc = cangle * complex(x, y) + ccenter
-            hull.append([cc.real, cc.imag])
+        ccenter = complex(x, y)        
+        cangle = cmath.exp(orientation * 1j)
+        hull = self.transform(self.hull, cangle, ccenter)
+        sail = self.transform(self.sail, cangle, ccenter)
 
-        if self.hull_view is not None:
-            canvas.delete(self.hull_view)        
-        
-        self.hull_view = canvas.create_polygon(hull, outline='red', 
-                                               fill='brown')
-        
-        sail = []
-        for x, y in self.sail:
-            cc = cangle * complex(x, y) + ccenter
-            sail.append([cc.real, cc.imag])
+        if self.hull_view is None:
+            self.hull_view = canvas.create_polygon(hull, outline='red', 
+                                                   fill='brown', tags='ship')
+            self.sail_view = canvas.create_polygon(sail, fill='white', 
+                                                   tags='ship')
+        else:
+            canvas.coords(self.hull_view, hull)
+            canvas.coords(self.sail_view, sail)
+            if not self.visible:
+                canvas.itemconfigure(self.hull_view, state='normal')
+                canvas.itemconfigure(self.sail_view, state='normal')
+        self.visible = True
 
-        if self.sail_view is not None:
-            canvas.delete(self.sail_view)        
-        
-        self.sail_view = canvas.create_polygon(sail, fill='white')
+    @staticmethod
+    def transform(points, cangle, ccenter):
+        """
+        Returns the flat coordinate list of the rotated and offset points
+        """
+        coords = []
+        for point in points:
+            cc = cangle * point + ccenter
+            coords.extend((cc.real, cc.imag))
+        return coords
 
     def clear(self, canvas):
-        canvas.delete(self.hull_view)
-        self.hull_view = None
-        canvas.delete(self.sail_view)
-        self.sail_view = None
-        
-        
\ No newline at end of file
+        """
+        Hides the ship, its canvas items are reused by the next update
+        """
+        if self.hull_view is not None and self.visible:
+            canvas.itemconfigure(self.hull_view, state='hidden')
+            canvas.itemconfigure(self.sail_view, state='hidden')
+        self.visible = False
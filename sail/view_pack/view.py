@@ -1,19 +1,35 @@
+import queue
 import time
 import tkinter as tk
 from .ship_view import ShipView
 from .buoy_view import BuoyView
 from .wind_view import WindView
+from .misc import race_label
 
 
 class View:
     """
     View class is responsible for all display functionalities on GUI
     Handles all objects visualization
+    Canvas items are created once and reused: ships and wind arrows are 
+    moved and hidden instead of being recreated
     """
-    def __init__(self):
+    def __init__(self, max_ships=20):
         """
         Initializes and opens the application window
+        Parameters
+        max_ships : int
+            maximum number of displayed ships
         """
+        self.display = False
+        self.max_ships = max_ships
+        self.ship_views = []
+        self.ship_count = 0
+        self.buoy_views = []
+        self.wind_view = None
+        # RenderQueue being rendered (see render)
+        self.source = None
+        
         # Main Window
         self.root = tk.Tk()               
         self.root.title("Sail")
@@ -44,59 +60,154 @@ class View:
         self.canvas = tk.Canvas(master=self.right_frame, 
                                 width=1160, height=750, bg='blue')
         self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=1)  
+        self.time_label = self.canvas.create_text(80, 30, text='', 
+                                                  font='Helvetica 20 bold', 
+                                                  fill='yellow', 
+                                                  state='hidden')
         
         self.root.update()
             
     def prepare_generation(self, model, display, generation_index, 
                            race_number=0, test=False):
         """
-        Initializes all view objects for display
+        Initializes all view objects for display, reusing the canvas items
+        of the former races
+        """
+        self.prepare_race(race_label(generation_index, race_number, test),
+                          display, model.wind, model.buoys, 
+                          min(len(model.population), self.max_ships))
+        self.root.update()
+        
+    def prepare_race(self, label, display, wind, buoys, ship_count):
+        """
+        Shows the title of the race and prepares the wind, buoy and ship
+        views of a displayed race
         """
         self.display = display
-        if test:
-            self.label['text'] = ('Test of ' + str(generation_index + 1) + 
-                                  '. generation')
+        self.label['text'] = label
+        self.buoy_views = []
+        if not display:
+            # no view objects are created for undisplayed races
+            return
+        if self.wind_view is None:
+            self.wind_view = WindView(self.canvas, wind)
         else:
-            self.label['text'] = (str(generation_index + 1) + '. generation - '
-                                  + str(race_number) + '. race')
-        self.wind_view = WindView(self.canvas, model.wind)
-        self.ship_views = []
-        for s in model.population:
+            self.wind_view.update(self.canvas, wind)
+        # ship views are created on demand and kept for the next races
+        while len(self.ship_views) < ship_count:
             self.ship_views.append(ShipView())
-        self.buoy_views = []
-        for i, buoy in enumerate(model.buoys):
+        self.ship_count = ship_count
+        for i, buoy in enumerate(buoys):
             self.buoy_views.append(BuoyView(self.canvas, buoy, i))        
-        self.root.update()
         
     def stop_update(self):
         self.display = False
+        if self.source is not None:
+            self.source.stop_update()
         
     def update(self, model, time_):
         """
         Calls update method of all view objects        
-        Updates and displays only 20 ship_views at most
+        Updates and displays only max_ships ship_views at most
         """
         if not self.display:
             return        
-        for i in range(min(len(self.ship_views), 20)): 
-            self.ship_views[i].update(self.canvas, model.population[i])
-        time_label = self.canvas.create_text(80, 30, 
-                                             text='Time: ' + str(time_), 
-                                             font='Helvetica 20 bold', 
-                                             fill='yellow')
+        for i in range(self.ship_count): 
+            ship = model.population[i]
+            self.ship_views[i].draw(self.canvas, ship.x, ship.y, 
+                                    ship.orientation)
+        self.show_time(time_)
         self.root.update()
         time.sleep(0.02)
-        self.canvas.delete(time_label)        
+        
+    def draw_frame(self, time_, x, y, orientation):
+        """
+        Moves the ships to the positions of a snapshot
+        """
+        if not self.display:
+            return
+        for i in range(min(self.ship_count, len(x))):
+            self.ship_views[i].draw(self.canvas, x[i], y[i], orientation[i])
+        self.show_time(time_)
+        
+    def show_time(self, time_):
+        self.canvas.itemconfigure(self.time_label, 
+                                  text='Time: ' + str(time_), state='normal')
+        
+    def render(self, source, fps=30):
+        """
+        Renders the snapshots of the given RenderQueue at fps frames per 
+        second at most until it is closed
+        Runs the mainloop, thus it must be called from the main thread while
+        the simulation runs on another thread
+        """
+        self.source = source
+        # number of the consumed control messages of the source
+        self.consumed = 0
+        interval = max(int(1000 / fps), 1)
+        def poll():
+            if self.consume(source):
+                self.root.quit()
+            else:
+                self.root.after(interval, poll)
+        self.root.after(interval, poll)
+        try:
+            self.root.mainloop()
+        finally:
+            source.closed = True
+            self.source = None
+        
+    def consume(self, source):
+        """
+        Processes the pending messages of the source, only the last frame
+        of a race is drawn, then shows the title of the latest undisplayed 
+        race unless a displayed race was prepared after it
+        Returns True if the source is closed
+        """
+        frame = None
+        while True:
+            try:
+                message = source.messages.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == 'frame':
+                frame = message
+                continue
+            # the pending frame belongs to the former race
+            frame = None
+            self.consumed += 1
+            if kind == 'prepare':
+                self.prepare_race(*message[1:])
+            elif kind == 'clear':
+                self.clear()
+            elif kind == 'close':
+                return True
+        if frame is not None:
+            self.draw_frame(*frame[1:])
+        title = source.title
+        if title is not None and title[0] == self.consumed:
+            self.display = False
+            self.label['text'] = title[1]
+        return False
         
     def clear(self):
+        """
+        Hides the reused ship, wind and time items and deletes the buoys
+        """
         for ship_view in self.ship_views:
             ship_view.clear(self.canvas)
-        for buoy_view in self.buoy_views:
-            buoy_view.clear(self.canvas)
-        self.wind_view.clear(self.canvas)
+        self.canvas.delete('buoy')
+        self.buoy_views = []
+        if self.wind_view is not None:
+            self.wind_view.clear(self.canvas)
+        self.canvas.itemconfigure(self.time_label, state='hidden')
         
     def mainloop(self):
         self.root.mainloop() 
+        
+    def close(self):
+        self.root.destroy()
 
        
         
\ No newline at end of file
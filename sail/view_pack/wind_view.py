@@ -5,6 +5,7 @@ import tkinter as tk
 class WindView:
     """
     Displays arrow representation of wind
+    The arrows are created once and reused for every race
     """    
     def __init__(self, canvas, wind):
         self.grid = 40
@@ -13,12 +14,25 @@ class WindView:
             wv = canvas.create_line(x * self.grid, y * self.grid, 
                                     x * self.grid + wind.x * 30, 
                                     y * self.grid + wind.y * 30, 
-                                    arrow=tk.LAST, fill='gray')
+                                    arrow=tk.LAST, fill='gray', tags='wind')
             self.wind_views.append(wv)
+        self.wind = wind
+            
+    def update(self, canvas, wind):
+        """
+        Turns the arrows to the direction of the given wind and shows them
+        """
+        if (wind.x, wind.y) != (self.wind.x, self.wind.y):
+            for (x, y), wv in zip(product(range(60), range(60)), 
+                                  self.wind_views):
+                canvas.coords(wv, x * self.grid, y * self.grid, 
+                              x * self.grid + wind.x * 30, 
+                              y * self.grid + wind.y * 30)
+            self.wind = wind
+        canvas.itemconfigure('wind', state='normal')
      
     def clear(self, canvas):
-        for wv in self.wind_views:
-            canvas.delete(wv) 
-        self.wind_views = None  
-                
-                
\ No newline at end of file
+        """
+        Hides all arrows at once by their tag
+        """
+        canvas.itemconfigure('wind', state='hidden')
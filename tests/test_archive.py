@@ -0,0 +1,91 @@
+import os
+import numpy as np
+import pytest
+from sail import Simulator
+from sail.islands import IslandModel, IslandSimulator
+from sail.log import QUIET, SimulationLog
+from sail.model_pack import GenomeArchive, GenomeLayout
+from sail.model_pack import archive
+
+
+def make_archive(path, count):
+    layout = GenomeLayout([2, 5, 1])
+    genomes = np.random.default_rng(0).normal(size=(count, layout.size))
+    GenomeArchive(path).extend(genomes, [2, 5, 1], range(count),
+                               np.arange(count, dtype='float64'), seed=7)
+    return genomes
+
+
+def test_archive_reopen(tmp_path):
+    path = str(tmp_path / 'genomes.sga')
+    genomes = make_archive(path, 50)
+    reopened = GenomeArchive(path)
+    assert len(reopened) == 50
+    assert reopened.append(genomes[3], [2, 5, 1], 0, 0.0) == 3
+    assert len(reopened) == 50
+    np.testing.assert_array_equal(reopened.top(3), [49, 48, 47])
+    np.testing.assert_array_equal(reopened.genome(49), genomes[49])
+    assert reopened.nn_architecture(0) == [2, 5, 1]
+    assert reopened.index['seed'][0] == b'7'
+
+
+def test_archive_recovers_interrupted_append(tmp_path, monkeypatch):
+    path = str(tmp_path / 'genomes.sga')
+    genomes = make_archive(path, 50)
+    extra = np.random.default_rng(1).normal(size=genomes.shape[1])
+
+    def interrupt(file, index, records_end):
+        raise KeyboardInterrupt
+    with monkeypatch.context() as m:
+        m.setattr(archive.GenomeArchive, 'write_index',
+                  staticmethod(interrupt))
+        with pytest.raises(KeyboardInterrupt):
+            GenomeArchive(path).append(extra, [2, 5, 1], 50, 50.0)
+    recovered = GenomeArchive(path)
+    assert len(recovered) == 51
+    assert recovered.nn_architecture(0) == [2, 5, 1]
+    np.testing.assert_array_equal(recovered.genome(50), extra)
+
+    # a partially written record is dropped
+    with open(path, 'r+b') as file:
+        file.truncate(recovered.records_end - 8)
+    recovered = GenomeArchive(path)
+    assert len(recovered) == 50
+    np.testing.assert_array_equal(recovered.genome(49), genomes[49])
+    assert os.path.getsize(path) == (recovered.records_end +
+                                     50 * archive.ENTRY.itemsize +
+                                     archive.TRAILER.itemsize)
+
+
+def test_islands_do_not_save_outstanding_networks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    island = IslandSimulator(0, nn_architecture=[5], generation_count=2,
+                             population_size=20, mutation_rate=30, seed=1)
+    island.save_test_result(1, 1900.0)
+    assert island.test_results[1] == 1900
+    generation_index, distance, genome = island.outstanding[0]
+    assert (generation_index, distance) == (1, 1900.0)
+    np.testing.assert_array_equal(genome, island.model.population.genomes[0])
+    assert not os.path.exists('simulation_results')
+
+
+def test_outstanding_island_networks_are_archived(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    evolve = IslandModel.evolve
+
+    def evolve_outstanding(self, start, stop):
+        # an outstanding test result of the first island
+        test_results, records, outstanding = evolve(self, start, stop)
+        genome = self.genomes[0, 0].copy()
+        outstanding = outstanding + [(start, 1900.0, genome)]
+        return test_results, records, outstanding
+    monkeypatch.setattr(IslandModel, 'evolve', evolve_outstanding)
+    genome_archive = GenomeArchive(str(tmp_path / 'genomes.sga'))
+    sim = Simulator([5], 4, 20, 30, headless=True, seed=1, islands=2,
+                    migration_interval=2, log=SimulationLog(QUIET),
+                    archive=genome_archive)
+    sim.run(plot=False)
+    assert len(genome_archive) == 2
+    np.testing.assert_array_equal(genome_archive.index['generation'], [0, 2])
+    assert genome_archive.nn_architecture(0) == [2, 5, 1]
+    assert not os.path.exists('simulation_results')
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from sail.model_pack import NeuralNetwork
+
+
+@pytest.mark.parametrize('nn_architecture',
+                         [[2, 1], [2, 2, 1], [2, 5, 1], [2, 4, 4, 1]])
+def test_save_and_load(tmp_path, monkeypatch, nn_architecture):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'simulation_results').mkdir()
+    nn = NeuralNetwork(nn_architecture)
+    nn.save(3, 1900.5)
+    loaded = NeuralNetwork([])
+    loaded.load('simulation_results/{}_3_1900.npz'.format(
+                                    str(nn_architecture).replace(' ', '')))
+    assert len(loaded.weights) == len(nn.weights)
+    for saved, restored in zip(nn.weights + nn.biases,
+                               list(loaded.weights) + list(loaded.biases)):
+        np.testing.assert_array_equal(restored, saved)
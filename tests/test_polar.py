@@ -0,0 +1,59 @@
+import math
+import numpy as np
+import pytest
+from sail.model_pack import AnalyticPolar, Polar, TabulatedPolar
+
+
+def test_polar_is_abstract():
+    with pytest.raises(TypeError):
+        Polar()
+
+
+def test_wind_angle_convention():
+    # the simulation's wind angle: 0 is running downwind, pi is head to wind
+    polar = AnalyticPolar()
+    np.testing.assert_allclose(polar.boat_speed(np.array([0, math.pi])),
+                               [20, 0])
+    # tables use the true wind angle: 0 is head to wind, 180 downwind
+    polar = TabulatedPolar.from_degrees([0, 45, 90, 135, 180],
+                                        [0, 6, 10, 12, 9])
+    np.testing.assert_allclose(polar.boat_speed(np.array([
+                                    math.pi, 3 * math.pi / 4, math.pi / 2,
+                                    math.pi / 4, 0])), [0, 6, 10, 12, 9],
+                               atol=1e-12)
+
+
+def test_tabulate_reproduces_the_analytic_polar():
+    analytic = AnalyticPolar()
+    tabulated = analytic.tabulate(1024)
+    angles = np.random.default_rng(0).uniform(0, math.pi, 10000)
+    # the piecewise linear polar is only approximated at its kink
+    np.testing.assert_allclose(tabulated.boat_speed(angles),
+                               analytic.boat_speed(angles), atol=1e-2)
+    grid = np.linspace(0, math.pi, 1025)
+    np.testing.assert_allclose(tabulated.boat_speed(grid),
+                               analytic.boat_speed(grid), atol=1e-12)
+
+
+@pytest.mark.parametrize('polar', [AnalyticPolar(),
+                                   AnalyticPolar().tabulate(),
+                                   TabulatedPolar.from_degrees(
+                                        [0, 45, 90, 135, 180],
+                                        [0, 6, 10, 12, 9])])
+@pytest.mark.parametrize('dtype', ['float64', 'float32'])
+def test_speed_into_matches_speed(polar, dtype):
+    rng = np.random.default_rng(1)
+    wind_angle = rng.uniform(-math.pi, math.pi, 1000).astype(dtype)
+    steer = rng.uniform(-0.2, 0.2, 1000).astype(dtype)
+    out = np.empty(1000, dtype=dtype)
+    polar.speed_into(wind_angle, steer, out, np.empty(1000, dtype=dtype),
+                     np.empty(1000, dtype='int64'),
+                     np.empty(1000, dtype=bool))
+    speed = polar.speed(wind_angle.astype('float64'),
+                        steer.astype('float64'))
+    np.testing.assert_allclose(out, speed, rtol=1e-5, atol=1e-5)
+    # turning ships sail at half speed
+    turning = np.abs(steer) > 0.1
+    np.testing.assert_allclose(speed[turning],
+                               polar.boat_speed(np.abs(wind_angle[turning]
+                                                .astype('float64'))) / 2)
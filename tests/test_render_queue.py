@@ -0,0 +1,30 @@
+import numpy as np
+from sail.model_pack import Model
+from sail.view_pack import RenderQueue
+
+
+def test_undisplayed_races_do_not_wait_for_the_renderer():
+    model = Model([2, 5, 1], 20, np.random.default_rng(0))
+    model.prepare_generation(False, 1, np.random.default_rng(1))
+    source = RenderQueue(max_frames=3)
+    # nothing consumes the queue, sending would block
+    for generation_index in range(10):
+        for race_number in (1, 2, 3):
+            source.prepare_generation(model, False, generation_index,
+                                      race_number)
+            source.update(model, 0)
+            source.clear()
+        source.prepare_generation(model, False, generation_index, test=True)
+        source.clear()
+    assert source.messages.empty()
+    assert source.title == (0, 'Test of 10. generation')
+
+    source.prepare_generation(model, True, 10, 1)
+    source.update(model, 0)
+    source.clear()
+    assert [message[0] for message in source.messages.queue] == [
+                                                'prepare', 'frame', 'clear']
+    # the title of a later undisplayed race is shown once the displayed race
+    # is consumed
+    source.prepare_generation(model, False, 10, 2)
+    assert source.title == (2, '11. generation - 2. race')
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from sail import Simulator
+from sail.log import QUIET, SimulationLog
+from sail.model_pack import FitnessCache, RetirementPolicy
+
+
+@pytest.fixture
+def simulate(tmp_path, monkeypatch):
+    """
+    Returns a function running a small headless simulation (in a temporary
+    working directory) and returning its test results
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def simulate(**kwargs):
+        settings = dict(nn_architecture=[5], generation_count=3,
+                        population_size=20, mutation_rate=30, race_count=2,
+                        headless=True, seed=1)
+        settings.update(kwargs)
+        sim = Simulator(log=SimulationLog(QUIET), **settings)
+        sim.run(plot=False)
+        return sim.test_results
+    return simulate
+
+
+def test_workers_give_same_results(simulate):
+    np.testing.assert_array_equal(simulate(workers=2), simulate())
+
+
+
+
+def test_batch_races_give_same_results(simulate):
+    np.testing.assert_array_equal(simulate(batch_races=True), simulate())
+    np.testing.assert_array_equal(simulate(batch_races=True,
+                                           random_race=False),
+                                  simulate(random_race=False))
+
+
+
+@pytest.mark.parametrize('kwargs', [{'pipeline': True},
+                                    {'pipeline': True, 'workers': 2}])
+def test_pipelined_test_races_give_same_results(simulate, kwargs):
+    np.testing.assert_array_equal(simulate(**kwargs), simulate())
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'batch_races': True},
+                                    {'retirement': RetirementPolicy(30)},
+                                    {'random_race': False,
+                                     'fixed_tracks': True,
+                                     'fitness_cache': FitnessCache(1000)}])
+def test_resume_continues_the_same_evolution(simulate, tmp_path, kwargs):
+    settings = dict(nn_architecture=[5], generation_count=6,
+                    population_size=20, mutation_rate=30, race_count=2,
+                    headless=True, seed=1, **kwargs)
+    # the simulation is interrupted after its 3rd generation
+    path = str(tmp_path / 'checkpoint.npz')
+    sim = Simulator(log=SimulationLog(QUIET), **settings)
+    for i in range(3):
+        sim.run_generation(i)
+    sim.next_generation = 3
+    sim.save_checkpoint(path)
+    resumed = Simulator.resume(path, headless=True, log=SimulationLog(QUIET),
+                               plot=False)
+    assert resumed.batch_races == sim.batch_races
+    assert (resumed.retirement is None) == (sim.retirement is None)
+    assert resumed.fixed_tracks == sim.fixed_tracks
+    np.testing.assert_array_equal(resumed.test_results, simulate(**settings))
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'random_race': False},
+                                    {'random_race': False,
+                                     'fixed_tracks': True},
+                                    {'random_race': False,
+                                     'fixed_tracks': True,
+                                     'batch_races': True}])
+def test_fitness_cache_does_not_change_results(simulate, kwargs):
+    cache = FitnessCache(1000)
+    np.testing.assert_array_equal(simulate(fitness_cache=cache, **kwargs),
+                                  simulate(**kwargs))
+    if kwargs.get('fixed_tracks'):
+        # the unchanged elite repeats the same races
+        assert cache.hits > 0